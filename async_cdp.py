@@ -0,0 +1,362 @@
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import shutil
+import subprocess
+import tempfile
+import time
+from urllib.parse import urlparse
+from driver_cache import CHROME_BINARIES
+from form_filler import FILL_FORM_JS, KEYSTROKE_FIELDS, LOCATE_JS
+from network_capture import FORM_ACTION_JS, match_form_response, site_of
+from step_engine import DEFAULT_CEILING, POLL_INTERVAL
+
+try:
+    import websockets
+except ImportError:  # only this backend needs it, pip install websockets
+    websockets = None
+
+# Same readiness rule as step_engine.element_interactable: attached, displayed and enabled
+ELEMENT_READY_JS = LOCATE_JS + """
+const element = find(arguments[0], arguments[1]);
+return !!element && element.getClientRects().length > 0 && !element.disabled;
+"""
+
+CLICK_JS = LOCATE_JS + """
+const element = find(arguments[0], arguments[1]);
+element.scrollIntoView({block: 'center'});
+element.click();
+"""
+
+FOCUS_JS = LOCATE_JS + """
+find(arguments[0], arguments[1]).focus();
+"""
+
+SUBMIT_ACTION_JS = LOCATE_JS + """
+const element = find(arguments[0], arguments[1]);
+""" + FORM_ACTION_JS
+
+
+class CDPError(Exception):
+    """A DevTools command failed or a page script threw"""
+
+
+def _find_chrome():
+    for binary in CHROME_BINARIES:
+        path = shutil.which(binary) or (binary if os.path.exists(binary) else None)
+        if path:
+            return path
+    raise FileNotFoundError(f"No Chrome binary found, tried {CHROME_BINARIES}")
+
+
+class Browser:
+    """One Chrome process driven over a single DevTools websocket, shared by every Session"""
+
+    def __init__(self, process, connection, user_data_dir):
+        self.process = process
+        self.connection = connection
+        self.user_data_dir = user_data_dir
+        self.ids = itertools.count(1)
+        self.pending = {}
+        self.sessions = {}
+        self.reader = asyncio.get_running_loop().create_task(self._read())
+
+    async def _read(self):
+        async for raw in self.connection:
+            message = json.loads(raw)
+            if "id" in message:
+                future = self.pending.pop(message["id"], None)
+                if future is None or future.done():
+                    continue
+                if "error" in message:
+                    future.set_exception(CDPError(message["error"].get("message", message["error"])))
+                else:
+                    future.set_result(message.get("result", {}))
+            elif message.get("sessionId") in self.sessions:
+                self.sessions[message["sessionId"]]._event(message["method"], message.get("params", {}))
+
+    async def send(self, method, params=None, session_id=None, timeout=DEFAULT_CEILING * 2):
+        command_id = next(self.ids)
+        message = {"id": command_id, "method": method, "params": params or {}}
+        if session_id:
+            message["sessionId"] = session_id
+        future = self.pending[command_id] = asyncio.get_running_loop().create_future()
+        await self.connection.send(json.dumps(message))
+        return await asyncio.wait_for(future, timeout)
+
+    async def new_session(self, isolated=True, user_agent=None, width=1920, height=1080):
+        """A new tab, in its own cookie/cache-clean browser context unless isolated=False"""
+        context_id = None
+        if isolated:
+            context_id = (await self.send("Target.createBrowserContext"))["browserContextId"]
+        params = {"url": "about:blank", "width": width, "height": height}
+        if context_id:
+            params["browserContextId"] = context_id
+        target_id = (await self.send("Target.createTarget", params))["targetId"]
+        attached = await self.send("Target.attachToTarget", {"targetId": target_id, "flatten": True})
+        session = self.sessions[attached["sessionId"]] = Session(self, attached["sessionId"], target_id, context_id)
+        await session.send("Page.enable")
+        await session.send("Network.enable")
+        if user_agent:
+            await session.send("Network.setUserAgentOverride", {"userAgent": user_agent})
+        return session
+
+    async def close(self):
+        try:
+            await self.send("Browser.close", timeout=5)
+        except Exception:
+            pass
+        await self.connection.close()
+        self.reader.cancel()
+        try:
+            await asyncio.wait_for(self.process.wait(), 10)
+        except asyncio.TimeoutError:
+            self.process.kill()
+        shutil.rmtree(self.user_data_dir, ignore_errors=True)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+        return False
+
+
+async def launch(binary=None, headless=True, args=(), ceiling=30):
+    """Start Chrome with remote debugging and connect to it, needs the websockets package"""
+    if websockets is None:
+        raise ImportError("async_cdp needs the websockets package: pip install websockets")
+    user_data_dir = tempfile.mkdtemp()
+    arguments = [
+        "--remote-debugging-port=0",
+        f"--user-data-dir={user_data_dir}",
+        "--no-sandbox",
+        "--disable-dev-shm-usage",
+        "--no-first-run",
+        "--disable-background-timer-throttling",
+        "--disable-renderer-backgrounding",
+        "--disable-backgrounding-occluded-windows",
+        *(["--headless=new"] if headless else []),
+        *args,
+        "about:blank",
+    ]
+    process = await asyncio.create_subprocess_exec(
+        binary or _find_chrome(), *arguments, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+
+    # Chrome writes the port it picked and the browser websocket path once it is listening
+    port_file = os.path.join(user_data_dir, "DevToolsActivePort")
+    deadline = time.monotonic() + ceiling
+    while True:
+        if os.path.exists(port_file):
+            with open(port_file, 'r') as f:
+                lines = f.read().split()
+            if len(lines) >= 2:
+                break
+        if process.returncode is not None or time.monotonic() > deadline:
+            process.kill()
+            raise CDPError("Chrome did not open a DevTools port")
+        await asyncio.sleep(POLL_INTERVAL)
+
+    connection = await websockets.connect(f"ws://127.0.0.1:{lines[0]}{lines[1]}", max_size=None)
+    return Browser(process, connection, user_data_dir)
+
+
+class Session:
+    """Async navigate/fill/select/click/submit/wait for one tab, mirroring step_engine.Steps"""
+
+    def __init__(self, browser, session_id, target_id, context_id, ceiling=DEFAULT_CEILING):
+        self.browser = browser
+        self.session_id = session_id
+        self.target_id = target_id
+        self.context_id = context_id
+        self.ceiling = ceiling
+        # Network.* events of this tab, in arrival order
+        self.network_events = []
+        self.waiters = {}
+        self.changed = asyncio.Event()
+
+    def _event(self, method, params):
+        if method.startswith("Network."):
+            self.network_events.append((method, params))
+            self.changed.set()
+        for future in self.waiters.pop(method, []):
+            if not future.done():
+                future.set_result(params)
+
+    def expect(self, method):
+        """Future for the next `method` event, create it before triggering the event"""
+        future = asyncio.get_running_loop().create_future()
+        self.waiters.setdefault(method, []).append(future)
+        return future
+
+    async def send(self, method, params=None):
+        return await self.browser.send(method, params, self.session_id)
+
+    async def evaluate(self, script, *args):
+        """Run a WebDriver-style script body (uses `return` and `arguments`) and return its value"""
+        result = await self.send("Runtime.evaluate", {
+            "expression": f"(function () {{\n{script}\n}}).apply(null, {json.dumps(list(args))})",
+            "returnByValue": True,
+            "awaitPromise": True,
+        })
+        if "exceptionDetails" in result:
+            details = result["exceptionDetails"]
+            raise CDPError(details.get("exception", {}).get("description", details.get("text")))
+        return result["result"].get("value")
+
+    async def add_script(self, source):
+        """Run source before page scripts on every document this tab loads, e.g. popup_watch.WATCHER_JS"""
+        await self.send("Page.addScriptToEvaluateOnNewDocument", {"source": source})
+
+    async def block(self, patterns):
+        """Block URL patterns for this tab, e.g. network_profile.blocked_patterns(profile)"""
+        await self.send("Network.setBlockedURLs", {"urls": list(patterns)})
+
+    async def wait(self, script, *args, ceiling=None, message=""):
+        """Poll a script until it returns something truthy"""
+        deadline = time.monotonic() + (ceiling or self.ceiling)
+        while True:
+            value = await self.evaluate(script, *args)
+            if value:
+                return value
+            if time.monotonic() > deadline:
+                raise TimeoutError(message or "condition not met")
+            await asyncio.sleep(POLL_INTERVAL)
+
+    async def navigate(self, url, ceiling=30):
+        """Return at DOMContentLoaded, like the eager page load strategy"""
+        loaded = self.expect("Page.domContentEventFired")
+        result = await self.send("Page.navigate", {"url": url})
+        if result.get("errorText"):
+            raise CDPError(f"{url}: {result['errorText']}")
+        await asyncio.wait_for(loaded, ceiling)
+
+    async def ready(self, locator, ceiling=None):
+        await self.wait(ELEMENT_READY_JS, *locator, ceiling=ceiling, message=f"{locator} not interactable")
+
+    async def _type_keys(self, text):
+        for char in text:
+            await self.send("Input.dispatchKeyEvent", {"type": "keyDown", "key": char, "text": char})
+            await self.send("Input.dispatchKeyEvent", {"type": "keyUp", "key": char})
+
+    async def fill(self, locators, values, keystrokes=KEYSTROKE_FIELDS):
+        """form_filler.fill_form() for this tab"""
+        fields = [[name, *locators[name].value, value, name in keystrokes] for name, value in values.items()]
+        result = await self.evaluate(FILL_FORM_JS, fields)
+        if result["missing"] or result["invalid"]:
+            raise CDPError(f"fill({locators.__name__}): missing {result['missing']}, invalid option {result['invalid']}")
+        for name in result["keystroke"]:
+            await self.evaluate(FOCUS_JS, *locators[name].value)
+            await self._type_keys(str(values[name]))
+
+    async def select(self, locator, index):
+        result = await self.evaluate(FILL_FORM_JS, [["select", *locator, index, False]])
+        if result["missing"] or result["invalid"]:
+            raise CDPError(f"{locator} has no option {index}")
+
+    async def click(self, locator):
+        await self.ready(locator)
+        await self.evaluate(CLICK_JS, *locator)
+
+    async def submit(self, locator, ceiling=None, methods=("POST",)):
+        """Click submit and return {"url", "method", "status", "latency"} once the form's request is answered"""
+        await self.ready(locator)
+        action = await self.evaluate(SUBMIT_ACTION_JS, *locator)
+        since = len(self.network_events)
+        site = site_of(await self.evaluate("return location.href;"))
+        await self.click(locator)
+        deadline = time.monotonic() + (ceiling or self.ceiling)
+        while True:
+            self.changed.clear()
+            response = match_form_response(self.network_events[since:], site, methods, action)
+            if response:
+                return response
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise TimeoutError("no form submission response seen")
+            try:
+                await asyncio.wait_for(self.changed.wait(), remaining)
+            except asyncio.TimeoutError:
+                pass
+
+    async def close(self):
+        await self.browser.send("Target.closeTarget", {"targetId": self.target_id})
+        if self.context_id:
+            await self.browser.send("Target.disposeBrowserContext", {"browserContextId": self.context_id})
+        self.browser.sessions.pop(self.session_id, None)
+
+
+async def submit_form(browser, url, locators, values, submit, first=None, blocked=(), scripts=()):
+    """Open url in a fresh session, fill values, submit and return the server's response"""
+    session = await browser.new_session()
+    try:
+        if blocked:
+            await session.block(blocked)
+        for source in scripts:
+            await session.add_script(source)
+        await session.navigate(url)
+        await session.ready((first or next(iter(locators))).value)
+        await session.ready(submit.value)
+        await session.fill(locators, values)
+        return await session.submit(submit.value)
+    finally:
+        await session.close()
+
+
+async def run_forms(jobs, concurrency=20, headless=True):
+    """
+    Run submit_form(**job) for every job dict in one Chrome, up to `concurrency` sessions at a
+    time on one event loop. Returns results in job order, failures as the raised exception.
+    """
+    limit = asyncio.Semaphore(concurrency)
+    async with await launch(headless=headless) as browser:
+        async def run(job):
+            async with limit:
+                return await submit_form(browser, **job)
+        return await asyncio.gather(*(run(job) for job in jobs), return_exceptions=True)
+
+
+def main(argv=None):
+    """Submit the misfinal contact forms against the stand-in site from concurrent sessions"""
+    from misfinal import URLS, ElementLocators
+    from standin_server import standin_url, start_server
+
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument("--sessions", type=int, default=24)
+    parser.add_argument("--concurrency", type=int, default=12)
+    parser.add_argument("--latency", type=float, default=0.2)
+    args = parser.parse_args(argv)
+
+    server, base_url = start_server(latency=args.latency)
+    urls = [standin_url(url, base_url) for _, url in URLS["contact_us"]]
+    jobs = [
+        {
+            "url": url,
+            "locators": ElementLocators,
+            "submit": ElementLocators.SUBMIT_BUTTON,
+            "values": {
+                "NAME_FIELD": "Test Automation",
+                "EMAIL_FIELD": f"async+{index}@example.com",
+                "PHONE_FIELD": "9909701409",
+                "SERVICE_DROPDOWN": 2,
+                "MESSAGE_FIELD": "This is a test automation script running.",
+            },
+        }
+        for index, url in zip(range(args.sessions), itertools.cycle(urls))
+    ]
+    started = time.perf_counter()
+    try:
+        results = asyncio.run(run_forms(jobs, args.concurrency))
+    finally:
+        server.shutdown()
+    for job, result in zip(jobs, results):
+        outcome = f"❌ {result!r}" if isinstance(result, BaseException) else f"✅ {result['status']} in {result['latency']:.2f}s"
+        print(f"{urlparse(job['url']).path:<50} {outcome}")
+    print(f"{len(jobs)} sessions in {time.perf_counter() - started:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
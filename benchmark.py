@@ -0,0 +1,270 @@
+import argparse
+import importlib
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from collections import defaultdict
+from selenium.webdriver.remote.command import Command
+from selenium.webdriver.remote.webdriver import WebDriver
+from standin_server import standin_url, start_server
+
+try:
+    import psutil
+except ImportError:  # CPU time and RSS are reported as None without psutil
+    psutil = None
+
+SUITES = ["bytes", "mis", "misnew", "misfinal", "mispopup", "nextstar"]
+BASELINE_FILE = os.path.join("benchmarks", "baseline.json")
+METRICS = ["wall_time", "commands", "cpu_time", "peak_rss_mb"]
+
+
+class ResourceSampler:
+    """Samples CPU time and RSS of every chromedriver/Chrome process tree started by a suite"""
+
+    def __init__(self, interval=0.2):
+        self.interval = interval
+        self.roots = set()
+        self.cpu = {}
+        self.peak_rss = 0
+        self.url_peak_rss = defaultdict(int)
+        self.current_url = None
+        self.lock = threading.Lock()
+        self.stopped = threading.Event()
+        self.thread = threading.Thread(target=self._run, daemon=True)
+
+    def watch(self, pid):
+        with self.lock:
+            self.roots.add(pid)
+
+    def sample(self):
+        if psutil is None:
+            return
+        rss = 0
+        with self.lock:
+            roots = list(self.roots)
+        for root in roots:
+            try:
+                processes = [psutil.Process(root)]
+                processes += processes[0].children(recursive=True)
+            except psutil.Error:
+                continue
+            for process in processes:
+                try:
+                    times = process.cpu_times()
+                    self.cpu[process.pid] = times.user + times.system
+                    rss += process.memory_info().rss
+                except psutil.Error:
+                    pass
+        with self.lock:
+            self.peak_rss = max(self.peak_rss, rss)
+            if self.current_url:
+                self.url_peak_rss[self.current_url] = max(self.url_peak_rss[self.current_url], rss)
+
+    def cpu_total(self):
+        return sum(self.cpu.values()) if psutil else None
+
+    def _run(self):
+        while not self.stopped.wait(self.interval):
+            self.sample()
+
+    def start(self):
+        self.thread.start()
+
+    def stop(self):
+        self.stopped.set()
+        self.thread.join()
+        self.sample()
+
+
+class CommandMeter:
+    """Counts WebDriver commands and wall time per navigated URL"""
+
+    def __init__(self, sampler):
+        self.sampler = sampler
+        self.total = 0
+        self.urls = defaultdict(lambda: {"commands": 0, "wall_time": 0.0, "cpu_time": None})
+        self.current = None
+        self.started = None
+        self.cpu_started = None
+        self.original = None
+
+    def install(self):
+        meter = self
+        original = self.original = WebDriver.execute
+
+        def execute(driver, driver_command, params=None):
+            meter.record(driver, driver_command, params)
+            return original(driver, driver_command, params)
+
+        WebDriver.execute = execute
+
+    def uninstall(self):
+        self.close_url()
+        WebDriver.execute = self.original
+
+    def record(self, driver, command, params):
+        service = getattr(driver, "service", None)
+        if service is not None and service.process is not None:
+            self.sampler.watch(service.process.pid)
+        if command == Command.GET:
+            self.close_url()
+            self.current = params["url"]
+            self.started = time.perf_counter()
+            self.sampler.sample()
+            self.sampler.current_url = self.current
+            self.cpu_started = self.sampler.cpu_total()
+        self.total += 1
+        if self.current:
+            self.urls[self.current]["commands"] += 1
+
+    def close_url(self):
+        if self.current is None:
+            return
+        row = self.urls[self.current]
+        row["wall_time"] += time.perf_counter() - self.started
+        self.sampler.sample()
+        if self.cpu_started is not None:
+            row["cpu_time"] = (row["cpu_time"] or 0) + self.sampler.cpu_total() - self.cpu_started
+        self.current = None
+
+
+def point_at_standin(module, base_url):
+    """Rewrite a suite's live URLs onto the stand-in server"""
+    urls = getattr(module, "URLS", None)
+    if isinstance(urls, dict):
+        for key, entries in urls.items():
+            urls[key] = [(country_name, standin_url(url, base_url)) for country_name, url in entries]
+    elif isinstance(urls, list):
+        urls[:] = [(name, standin_url(url, base_url), *rest) for name, url, *rest in urls]
+    if hasattr(module, "STARTING_URL"):
+        module.STARTING_URL = standin_url(module.STARTING_URL, base_url)
+
+
+def run_suite(name, base_url):
+    module = importlib.import_module(name)
+    point_at_standin(module, base_url)
+
+    counter_file = os.path.join(tempfile.mkdtemp(), "email_counter.txt")
+    test_classes = [
+        obj for obj in vars(module).values()
+        if isinstance(obj, type) and issubclass(obj, unittest.TestCase) and obj.__module__ == name
+    ]
+    for test_class in test_classes:
+        # Never touch the real counter or mail anyone from a benchmark
+        test_class.counter_file = counter_file
+        test_class.send_email_report = classmethod(lambda cls: None)
+
+    sampler = ResourceSampler()
+    meter = CommandMeter(sampler)
+    sampler.start()
+    meter.install()
+    started = time.perf_counter()
+    try:
+        suite = unittest.defaultTestLoader.loadTestsFromModule(module)
+        with open(os.devnull, 'w') as devnull:
+            result = unittest.TextTestRunner(stream=devnull, verbosity=0).run(suite)
+    finally:
+        wall_time = time.perf_counter() - started
+        meter.uninstall()
+        sampler.stop()
+
+    peak_rss = sampler.peak_rss / 2 ** 20 if psutil else None
+    return {
+        "wall_time": wall_time,
+        "commands": meter.total,
+        "cpu_time": sampler.cpu_total(),
+        "peak_rss_mb": peak_rss,
+        "tests_run": result.testsRun,
+        "errors": len(result.errors) + len(result.failures),
+        "passed_urls": sum(cls.results.count("passed") for cls in test_classes if hasattr(cls, "results")),
+        "failed_urls": sum(cls.results.count("failed") for cls in test_classes if hasattr(cls, "results")),
+        "urls": {
+            url: dict(row, peak_rss_mb=sampler.url_peak_rss[url] / 2 ** 20 if psutil else None)
+            for url, row in meter.urls.items()
+        },
+    }
+
+
+def compare(results, baseline, threshold):
+    """Metrics more than `threshold` (fraction) above baseline"""
+    regressions = []
+    for suite, metrics in results.items():
+        for metric in METRICS:
+            current, previous = metrics.get(metric), baseline.get(suite, {}).get(metric)
+            if current is None or not previous:
+                continue
+            if current > previous * (1 + threshold):
+                regressions.append(f"{suite}.{metric}: {previous:.2f} -> {current:.2f} (+{(current / previous - 1) * 100:.0f}%)")
+    return regressions
+
+
+def _fmt(value, spec):
+    return "-" if value is None else format(value, spec)
+
+
+def print_report(results):
+    print(f"\n{'suite':<10} {'wall s':>8} {'cmds':>6} {'cpu s':>8} {'rss MB':>8}")
+    for suite, metrics in results.items():
+        print(f"{suite:<10} {_fmt(metrics['wall_time'], '8.1f')} {metrics['commands']:>6} "
+              f"{_fmt(metrics['cpu_time'], '8.1f')} {_fmt(metrics['peak_rss_mb'], '8.0f')}")
+        for url, row in metrics["urls"].items():
+            print(f"  {url:<80} {_fmt(row['wall_time'], '6.1f')}s {row['commands']:>5} cmds "
+                  f"cpu {_fmt(row['cpu_time'], '.1f')}s rss {_fmt(row['peak_rss_mb'], '.0f')}MB")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the suites against the local stand-in site")
+    parser.add_argument("--suites", nargs="+", default=SUITES, choices=SUITES)
+    parser.add_argument("--latency", type=float, default=0.2, help="stand-in server latency in seconds")
+    parser.add_argument("--popup-delay", type=float, default=20, help="service page popup delay in seconds")
+    parser.add_argument("--virtual-time", action="store_true", help="fast-forward page timers (MIS_VIRTUAL_TIME=1)")
+    parser.add_argument("--baseline", default=BASELINE_FILE)
+    parser.add_argument("--save-baseline", action="store_true", help="write these results as the new baseline")
+    parser.add_argument("--threshold", type=float, default=0.10, help="allowed regression over baseline, 0.10 = 10%%")
+    parser.add_argument("--output", help="write the full results as JSON")
+    args = parser.parse_args(argv)
+    if args.virtual_time:
+        os.environ["MIS_VIRTUAL_TIME"] = "1"
+
+    server, base_url = start_server(latency=args.latency, popup_delay=args.popup_delay)
+    results = {}
+    try:
+        for name in args.suites:
+            print(f"Benchmarking {name} against {base_url}...")
+            try:
+                results[name] = run_suite(name, base_url)
+            except ImportError as e:
+                print(f"Skipping {name}: {e}")
+    finally:
+        server.shutdown()
+
+    print_report(results)
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+
+    if args.save_baseline:
+        os.makedirs(os.path.dirname(args.baseline) or ".", exist_ok=True)
+        with open(args.baseline, 'w') as f:
+            json.dump({suite: {m: metrics[m] for m in METRICS} for suite, metrics in results.items()}, f, indent=2)
+        print(f"Baseline saved to {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print("No baseline yet, run with --save-baseline to record one.")
+        return 0
+    with open(args.baseline, 'r') as f:
+        regressions = compare(results, json.load(f), args.threshold)
+    for regression in regressions:
+        print(f"❌ Regression {regression}")
+    if not regressions:
+        print("✅ No regressions over baseline")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,96 @@
+class IsolatedContext:
+    """A fresh incognito-style browser context opened inside the running Chrome"""
+
+    def __init__(self, driver, context_id, handle, previous_handle):
+        self.driver = driver
+        self.context_id = context_id
+        self.handle = handle
+        self.previous_handle = previous_handle
+
+    def close(self):
+        """Dispose the context (and its tabs) and switch back to the original window"""
+        if self.context_id is None:
+            return
+        self.driver.switch_to.window(self.previous_handle)
+        try:
+            self.driver.execute_cdp_cmd("Target.disposeBrowserContext", {"browserContextId": self.context_id})
+        except Exception as e:
+            print(f"Could not dispose browser context: {e}")
+        self.context_id = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+
+def _handle_for_target(driver, target_id):
+    # ChromeDriver window handles are the CDP target id, older versions prefix it with "CDwindow-"
+    for handle in driver.window_handles:
+        if handle == target_id or handle.endswith(target_id):
+            return handle
+    raise RuntimeError(f"No window handle for target {target_id}")
+
+
+def new_isolated_context(driver, user_agent=None, width=1920, height=1080):
+    """
+    Open a cookie/cache/storage-clean browser context in the running Chrome and switch to it.
+    Costs a new tab instead of a new browser, use as a context manager to dispose it afterwards.
+    """
+    previous_handle = driver.current_window_handle
+    context = driver.execute_cdp_cmd("Target.createBrowserContext", {})
+    target = driver.execute_cdp_cmd("Target.createTarget", {
+        "url": "about:blank",
+        "browserContextId": context["browserContextId"],
+        "width": width,
+        "height": height,
+    })
+    handle = _handle_for_target(driver, target["targetId"])
+    driver.switch_to.window(handle)
+
+    if user_agent:
+        driver.execute_cdp_cmd("Network.setUserAgentOverride", {"userAgent": user_agent})
+
+    return IsolatedContext(driver, context["browserContextId"], handle, previous_handle)
+
+
+# Tabs that are not in front otherwise get their timers and rendering throttled
+BACKGROUND_TAB_ARGS = [
+    "--disable-background-timer-throttling",
+    "--disable-renderer-backgrounding",
+    "--disable-backgrounding-occluded-windows",
+]
+
+
+def keep_background_tabs_running(options):
+    """Let tabs keep loading and running scripts while another tab is being driven"""
+    for argument in BACKGROUND_TAB_ARGS:
+        options.add_argument(argument)
+    return options
+
+
+def open_tab(driver, url, prepare=None):
+    """
+    Open url in a new tab of the running Chrome and switch to it without waiting for the load, so
+    several tabs load at once. prepare(driver) runs in the new tab before it navigates.
+    """
+    target = driver.execute_cdp_cmd("Target.createTarget", {"url": "about:blank"})
+    handle = _handle_for_target(driver, target["targetId"])
+    driver.switch_to.window(handle)
+    if prepare:
+        prepare(driver)
+    driver.execute_cdp_cmd("Page.navigate", {"url": url})
+    return handle
+
+
+def close_tabs(driver, handles, return_to):
+    """Close the tabs opened with open_tab() and switch back to return_to"""
+    for handle in handles:
+        try:
+            driver.switch_to.window(handle)
+            driver.close()
+        except Exception as e:
+            print(f"Could not close tab: {e}")
+    driver.switch_to.window(return_to)
@@ -5,11 +5,21 @@ import time
 from enum import Enum
 from selenium import webdriver
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import Select, WebDriverWait
+from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.chrome.service import Service
-from webdriver_manager.chrome import ChromeDriverManager
+from driver_cache import chromedriver_path
+from failure_artifacts import ArtifactWriter
+import failure_artifacts
+import preflight
+from results_store import ResultsStore
+from step_engine import Steps
+from network_profile import apply_blocking_profile, profile_for, report_blocked
+import network_capture
+from navigation import open_form_page, use_eager_loading
+from timeline import Timeline
 from env_sender import smtp_send
+import report_mailer
 from dotenv import load_dotenv
 
 class ContactUsLocators(Enum):
@@ -86,82 +96,74 @@ URLS = [
 
 class BytesTests(unittest.TestCase):
     load_dotenv()
-    counter_file = "email_counter.txt"
-    passed_urls = []
-    failed_urls = []
 
     @classmethod
     def setUpClass(cls):
+        # Pages that cannot pass are failed without a browser session
+        cls.preflight_failures = preflight.run({url: preflight.markers(locators) for _, url, locators in URLS})
+
         options = webdriver.ChromeOptions()
         # options.add_argument("--headless")
         options.add_argument("--window-size=1920,1080")
         options.add_argument("--disable-gpu")
         options.add_argument("--no-sandbox")
         options.add_argument("--disable-dev-shm-usage")
+        network_capture.enable(options)
+        failure_artifacts.enable(options)
+        use_eager_loading(options)
 
-        cls.driver = webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=options)
+        cls.driver = webdriver.Chrome(service=Service(chromedriver_path()), options=options)
         cls.wait = WebDriverWait(cls.driver, 30)
-
-        if os.path.exists(cls.counter_file):
-            with open(cls.counter_file, 'r') as f:
-                cls.email_counter = int(f.read().strip())
-        else:
-            cls.email_counter = 1
+        cls.timeline = Timeline("bytes")
+        cls.steps = Steps(cls.driver, ceiling=30, timeline=cls.timeline)
+        # Screenshot, DOM snapshot and console log of failed pages, written off the test thread
+        cls.artifacts = ArtifactWriter(cls.timeline.run_id)
+        cls.results = ResultsStore("bytes")
 
     def fill_input(self, locator, value):
         try:
             element = self.wait.until(EC.presence_of_element_located(locator))
             self.driver.execute_script("arguments[0].scrollIntoView(true);", element)
-            self.wait.until(EC.visibility_of(element))
-            element.clear()
-            element.send_keys(value)    
+            self.steps.type(element, value, clear=True)
         except Exception as e:
             raise Exception(f"Error in fill_input({locator}): {str(e)}")
 
     def test_website_forms(self):
         for test_name, url, locators in URLS:
             with self.subTest(test_name=test_name, url=url):
+                started = time.perf_counter()
                 try:
                     print(f"\n🔍 Testing: {test_name} - {url}")
-                    self.driver.get(url)
+                    preflight.ensure(self.preflight_failures, url)
+                    self.steps.url = url
+                    apply_blocking_profile(self.driver, profile_for(url))
+                    with self.timeline.step("navigation", url):
+                        open_form_page(self.driver, url, locators)
 
                     if locators == CareerFormLocators:
                     # Career Form handling
                         self.fill_input(locators.FULL_NAME.value, "Ilfas Mansuri")
-                        time.sleep(5)
                         self.fill_input(locators.EMAIL_ID.value, "ilfas.mansuri@bytestechnolab.com")
-                        time.sleep(5)
                         self.fill_input(locators.CONTACT_NUMBER.value, "9876543210")
-                        time.sleep(5)
                         self.fill_input(locators.TOTAL_EXP.value, "3")
-                        time.sleep(5)
                         self.fill_input(locators.RELEVANT_EXP.value, "2")
-                        time.sleep(5)
                         self.fill_input(locators.CURRENT_CTC.value, "500000")
-                        time.sleep(5)
                         self.fill_input(locators.EXPECTED_CTC.value, "700000")
-                        time.sleep(5)
                         self.fill_input(locators.CURRENT_LOCATOIN.value, "Ahmedabad")
-                        time.sleep(5)
                         self.fill_input(locators.NOTICE_PERIOD.value, "30 Days")
-                        time.sleep(5)
                         # File upload (resume)
                         resume_path = os.path.abspath("/home/rutvik/Documents/Fake-Resume.pdf")
-                        self.wait.until(EC.presence_of_element_located(locators.RESUME_UPLOAD.value)).send_keys(resume_path)
-                        time.sleep(5)
+                        with self.timeline.step("fill", url, "resume"):
+                            self.wait.until(EC.presence_of_element_located(locators.RESUME_UPLOAD.value)).send_keys(resume_path)
                         # Submit
-                        submit_button = self.wait.until(EC.element_to_be_clickable(locators.SUBMIT_BUTTON.value))
                         # self.driver.execute_script("arguments[0].scrollIntoView(true);", submit_button)
                         # self.driver.execute_script("arguments[0].click();", submit_button)
 
                     else:
                     # Default handling for Contact Us, Let's Talk, Our Services, Hire Developers
                         self.fill_input(locators.FULL_NAME.value, "Test Bytes")
-                        time.sleep(2)
                         self.fill_input(locators.EMAIL_ID.value, "ilfas.mansuri@bytestechnolab.com")
-                        time.sleep(2)
                         self.fill_input(locators.CONTACT_NUMBER.value, "9687414356")
-                        time.sleep(2)
 
                         if hasattr(locators, "COMPANY_URL"):
                             self.fill_input(locators.COMPANY_URL.value, "Test Bytes Technolab")
@@ -173,32 +175,33 @@ class BytesTests(unittest.TestCase):
                             dropdown_locator = getattr(locators, field).value
                             dropdown = self.wait.until(EC.element_to_be_clickable(dropdown_locator))
                             self.driver.execute_script("arguments[0].scrollIntoView(true);", dropdown)
-                            Select(dropdown).select_by_index(1)
+                            self.steps.select(dropdown, 1)
 
                     if hasattr(locators, "PROJECT_DESCRIPTION"):
                         self.fill_input(locators.PROJECT_DESCRIPTION.value, "Automation testing form submission")
 
                     # Submit
-                    submit_button = self.wait.until(EC.element_to_be_clickable(locators.SUBMIT_BUTTON.value))
-                    self.driver.execute_script("arguments[0].scrollIntoView(true);", submit_button)
-                    self.driver.execute_script("arguments[0].click();", submit_button)
-
-                    time.sleep(10)  # Wait for submission
-                    self.email_counter += 1
+                    response = self.steps.submit_confirmed(locators.SUBMIT_BUTTON.value, js=True)
+                    print(f"Submission answered {response['status']} in {response['latency']:.2f}s")
                     print(f"✅ Passed: {test_name}")
-                    self.passed_urls.append(f"✅ {test_name} - {url}")
+                    self.results.passed(test_name, url, duration=time.perf_counter() - started)
 
                 except Exception as e:
                     print(f"❌ Failed: {test_name}\n{traceback.format_exc()}")
-                    screenshot = f"screenshot_{test_name.replace(' ', '_')}.png"
-                    self.driver.save_screenshot(screenshot)
-                    self.failed_urls.append(f"❌{test_name} - {url} - {str(e)}")
+                    artifacts = None
+                    if not isinstance(e, preflight.PreflightFailed):
+                        artifacts = self.artifacts.capture(self.driver, test_name, url)
+                        print(f"Failure artifacts: {', '.join(artifacts.values())}")
+                    self.results.failed(test_name, url, duration=time.perf_counter() - started, error=e, artifacts=artifacts)
+                finally:
+                    report_blocked(self.driver, url)
 
     @classmethod
     def tearDownClass(cls):
         cls.driver.quit()
-        with open(cls.counter_file, 'w') as f:
-            f.write(str(cls.email_counter))
+        cls.artifacts.close()
+        print(f"Timeline written to {cls.timeline.save()}")
+        cls.timeline.print_summary()
 
         # Uncomment to send email report
         # cls.send_email_report()
@@ -214,12 +217,13 @@ class BytesTests(unittest.TestCase):
         email_body = f"""
         <h3>Automation Report</h3>
         <p><b>Passed:</b></p>
-        <ul>{''.join(f"<li>{url}</li>" for url in cls.passed_urls)}</ul>
+        <ul>{''.join(f"<li>{line}</li>" for line in cls.results.lines("passed"))}</ul>
         <p><b>Failed:</b></p>
-        <ul>{''.join(f"<li>{url}</li>" for url in cls.failed_urls) if cls.failed_urls else '<li>No test failures 🎉</li>'}</ul>
+        <ul>{''.join(f"<li>{line}</li>" for line in cls.results.lines("failed")) or '<li>No test failures 🎉</li>'}</ul>
         """
 
-        smtp_send(
+        report_mailer.send(
+            smtp_send,
             sender_email=sender_email,
             receiver_email=receiver_email,
             cc_email=cc_email,
@@ -227,7 +231,7 @@ class BytesTests(unittest.TestCase):
             password=password,
             email_body=email_body
         )
-        print("📧 Email sent.")
+        print("📧 Email queued.")
 
 if __name__ == "__main__":
     unittest.main()
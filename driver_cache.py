@@ -0,0 +1,83 @@
+import functools
+import json
+import os
+import re
+import subprocess
+import sys
+import tempfile
+from webdriver_manager.chrome import ChromeDriverManager
+
+# Shared by every suite, override with CHROMEDRIVER_CACHE
+CACHE_FILE = os.getenv(
+    "CHROMEDRIVER_CACHE",
+    os.path.join(os.path.expanduser("~"), ".cache", "bytes-mis-pages", "chromedriver.json"),
+)
+
+CHROME_BINARIES = [
+    "google-chrome",
+    "google-chrome-stable",
+    "chromium",
+    "chromium-browser",
+    "/Applications/Google Chrome.app/Contents/MacOS/Google Chrome",
+]
+
+_resolved = {}
+
+
+@functools.lru_cache(maxsize=None)
+def installed_chrome_version():
+    """Return the local Chrome version without touching the network, or None"""
+    if sys.platform.startswith("win"):
+        commands = [["reg", "query", r"HKEY_CURRENT_USER\Software\Google\Chrome\BLBeacon", "/v", "version"]]
+    else:
+        commands = [[binary, "--version"] for binary in CHROME_BINARIES]
+
+    for command in commands:
+        try:
+            output = subprocess.run(command, capture_output=True, text=True, timeout=5).stdout
+        except (OSError, subprocess.SubprocessError):
+            continue
+        match = re.search(r"\d+\.\d+\.\d+\.\d+", output)
+        if match:
+            return match.group(0)
+    return None
+
+
+def _load_cache():
+    try:
+        with open(CACHE_FILE, 'r') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_cache(cache):
+    os.makedirs(os.path.dirname(CACHE_FILE), exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(CACHE_FILE))
+    with os.fdopen(fd, 'w') as f:
+        json.dump(cache, f, indent=2)
+    os.replace(tmp_path, CACHE_FILE)
+
+
+def chromedriver_path():
+    """Resolve chromedriver for the installed Chrome, downloading only on a cache miss"""
+    version = installed_chrome_version()
+    if version in _resolved:
+        return _resolved[version]
+
+    if version is None:
+        # Chrome version unknown (unusual install location), no cached driver is known to match it,
+        # let webdriver_manager detect the browser itself
+        path = ChromeDriverManager().install()
+        _resolved[version] = path
+        return path
+
+    cache = _load_cache()
+    path = cache.get(version)
+    if not path or not os.path.exists(path):
+        path = ChromeDriverManager().install()
+        cache[version] = path
+        _save_cache(cache)
+
+    _resolved[version] = path
+    return path
@@ -0,0 +1,65 @@
+import os
+import tempfile
+from file_lock import locked
+
+# Shared by every suite, holds the next number nobody has reserved yet
+COUNTER_FILE = "email_counter.txt"
+
+# Numbers a process takes per locked file update, override with EMAIL_BLOCK_SIZE
+BLOCK_SIZE = int(os.getenv("EMAIL_BLOCK_SIZE", "20"))
+
+
+def _read(path):
+    try:
+        with open(path, 'r') as f:
+            return int(f.read().strip())
+    except (OSError, ValueError):
+        return 1
+
+
+def _write(path, value):
+    # Temp file + rename, a crash leaves either the old or the new number, never a torn one
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)))
+    with os.fdopen(fd, 'w') as f:
+        f.write(str(value))
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+def reserve(count, path=COUNTER_FILE):
+    """Take `count` consecutive numbers for this process and return the first"""
+    with locked(path):
+        first = _read(path)
+        _write(path, first + count)
+    return first
+
+
+class EmailCounter:
+    """
+    Unique address numbers for one process. Numbers are reserved BLOCK_SIZE at a time, so
+    parallel workers and suites never hand out the same one and most calls touch no file.
+    A crash only skips the rest of a block, it never reuses a number.
+    """
+
+    def __init__(self, path=COUNTER_FILE, block_size=BLOCK_SIZE):
+        self.path = path
+        self.block_size = block_size
+        self.next_value = self.end = 0
+
+    def next(self):
+        if self.next_value >= self.end:
+            self.next_value = reserve(self.block_size, self.path)
+            self.end = self.next_value + self.block_size
+        value = self.next_value
+        self.next_value += 1
+        return value
+
+    def release(self):
+        """Hand back the unused rest of the block if nobody has reserved after it"""
+        if self.next_value >= self.end:
+            return
+        with locked(self.path):
+            if _read(self.path) == self.end:
+                _write(self.path, self.next_value)
+        self.end = self.next_value
@@ -0,0 +1,131 @@
+import gzip
+import hashlib
+import io
+import json
+import os
+import queue
+import threading
+import time
+from contextlib import contextmanager
+
+try:
+    from PIL import Image
+except ImportError:  # screenshots are kept as the PNG Chrome returns without Pillow
+    Image = None
+
+ARTIFACTS_DIR = os.getenv("ARTIFACTS_DIR", "artifacts")
+
+# Screenshots wider than this are scaled down before encoding
+MAX_WIDTH = 1280
+WEBP_QUALITY = 70
+
+
+def enable(options):
+    """Keep Chrome's console messages so a failure can save them, call after network_capture.enable"""
+    prefs = dict(options.capabilities.get("goog:loggingPrefs", {}))
+    prefs["browser"] = "ALL"
+    options.set_capability("goog:loggingPrefs", prefs)
+    return options
+
+
+def _encode_screenshot(png):
+    if Image is None:
+        return png
+    image = Image.open(io.BytesIO(png))
+    if image.width > MAX_WIDTH:
+        image = image.resize((MAX_WIDTH, round(image.height * MAX_WIDTH / image.width)))
+    out = io.BytesIO()
+    image.save(out, "WEBP", quality=WEBP_QUALITY)
+    return out.getvalue()
+
+
+def _gzip(data):
+    return gzip.compress(data, compresslevel=6)
+
+
+class ArtifactWriter:
+    """
+    Saves a screenshot, an MHTML snapshot and the console log of a failed page. Only the capture
+    runs on the test's thread, encoding, compression and writes happen on a background thread.
+    Files are named by the hash of their content inside a directory per run, so repeated failures
+    never overwrite each other and identical captures are stored once.
+    """
+
+    def __init__(self, run_id, directory=ARTIFACTS_DIR):
+        self.directory = os.path.join(directory, run_id)
+        self.jobs = queue.Queue()
+        self.thread = threading.Thread(target=self._work, name=f"artifacts-{run_id}", daemon=True)
+        self.thread.start()
+
+    def _path(self, data, extension):
+        return os.path.join(self.directory, f"{hashlib.sha256(data).hexdigest()[:16]}.{extension}")
+
+    def capture(self, driver, label, url):
+        """Grab the current tab's state and queue it for writing, returns {kind: path}"""
+        raw = {}
+        try:
+            raw["screenshot"] = driver.get_screenshot_as_png()
+        except Exception as e:
+            print(f"Could not take screenshot: {e}")
+        try:
+            raw["snapshot"] = driver.execute_cdp_cmd("Page.captureSnapshot", {"format": "mhtml"})["data"].encode()
+        except Exception as e:
+            print(f"Could not capture DOM snapshot: {e}")
+        try:
+            # Everything Chrome logged since the previous capture, reading the log clears it
+            raw["console"] = json.dumps(driver.get_log("browser"), indent=2).encode()
+        except Exception as e:
+            print(f"Could not read console log: {e}")
+
+        extensions = {
+            "screenshot": "png" if Image is None else "webp",
+            "snapshot": "mhtml.gz",
+            "console": "json.gz",
+        }
+        paths = {kind: self._path(data, extensions[kind]) for kind, data in raw.items()}
+        self.jobs.put((raw, paths, {"label": label, "url": url, "time": time.time(), "artifacts": paths}))
+        return paths
+
+    @contextmanager
+    def capturing(self, driver, label, url):
+        """
+        Capture an exception's page state before it leaves the block, e.g. while a tab that closes
+        on the way out is still open. The paths are kept on the exception as `artifacts`.
+        """
+        try:
+            yield
+        except Exception as e:
+            if not hasattr(e, "artifacts"):
+                e.artifacts = self.capture(driver, label, url)
+            raise
+
+    def _work(self):
+        while True:
+            job = self.jobs.get()
+            try:
+                if job is None:
+                    return
+                self._write(*job)
+            except Exception as e:
+                print(f"Could not save failure artifacts: {e}")
+            finally:
+                self.jobs.task_done()
+
+    def _write(self, raw, paths, entry):
+        os.makedirs(self.directory, exist_ok=True)
+        for kind, data in raw.items():
+            if os.path.exists(paths[kind]):
+                continue
+            encoded = _encode_screenshot(data) if kind == "screenshot" else _gzip(data)
+            tmp_path = paths[kind] + ".tmp"
+            with open(tmp_path, 'wb') as f:
+                f.write(encoded)
+            os.replace(tmp_path, paths[kind])
+        with open(os.path.join(self.directory, "index.jsonl"), 'a') as f:
+            f.write(json.dumps(entry) + "\n")
+
+    def close(self):
+        """Wait for every queued capture to be written"""
+        if self.thread.is_alive():
+            self.jobs.put(None)
+            self.thread.join()
@@ -0,0 +1,26 @@
+import sys
+from contextlib import contextmanager
+
+if sys.platform.startswith("win"):
+    import msvcrt
+else:
+    import fcntl
+
+
+@contextmanager
+def locked(path):
+    """Exclusive lock on path + ".lock", held across processes until the block exits"""
+    with open(path + ".lock", 'a+') as lock:
+        if sys.platform.startswith("win"):
+            lock.seek(0)
+            msvcrt.locking(lock.fileno(), msvcrt.LK_LOCK, 1)
+        else:
+            fcntl.flock(lock.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if sys.platform.startswith("win"):
+                lock.seek(0)
+                msvcrt.locking(lock.fileno(), msvcrt.LK_UNLCK, 1)
+            else:
+                fcntl.flock(lock.fileno(), fcntl.LOCK_UN)
@@ -0,0 +1,69 @@
+from selenium.common.exceptions import NoSuchElementException
+
+# find(by, selector) for the By strategies the locator Enums use
+LOCATE_JS = """
+const find = (by, selector) => {
+    switch (by) {
+        case 'id': return document.getElementById(selector);
+        case 'name': return document.getElementsByName(selector)[0] || null;
+        case 'class name': return document.getElementsByClassName(selector)[0] || null;
+        case 'tag name': return document.getElementsByTagName(selector)[0] || null;
+        case 'xpath': return document.evaluate(selector, document, null,
+                                               XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+        default: return document.querySelector(selector);
+    }
+};
+"""
+
+# Resolves every locator, sets every value and fires the events a user would, in one round trip
+FILL_FORM_JS = LOCATE_JS + """
+const fields = arguments[0];
+const fire = (element, type) => element.dispatchEvent(new Event(type, {bubbles: true}));
+const result = {missing: [], invalid: [], keystroke: {}};
+for (const [name, by, selector, value, keystroke] of fields) {
+    const element = find(by, selector);
+    if (!element) { result.missing.push(name); continue; }
+    if (keystroke) { result.keystroke[name] = element; continue; }
+    element.focus();
+    if (element.tagName === 'SELECT') {
+        if (typeof value === 'number') {
+            if (element.options.length <= value) { result.invalid.push(name); continue; }
+            element.selectedIndex = value;
+        } else {
+            element.value = value;
+        }
+    } else {
+        // Native setter so framework-controlled inputs notice the change
+        const proto = element.tagName === 'TEXTAREA' ? HTMLTextAreaElement.prototype : HTMLInputElement.prototype;
+        Object.getOwnPropertyDescriptor(proto, 'value').set.call(element, value);
+    }
+    fire(element, 'input');
+    fire(element, 'change');
+    element.blur();
+}
+return result;
+"""
+
+# Masked phone inputs only accept real keystrokes
+KEYSTROKE_FIELDS = ("PHONE_FIELD", "POPUP_PHONE", "JOB_PHONE", "CONTACT_NUMBER")
+
+
+def fill_form(driver, locators, values, keystrokes=KEYSTROKE_FIELDS):
+    """
+    Fill a form from a {locator name: value} map for a locator Enum in a single script call.
+    Integer values on <select> elements pick that option index, fields named in `keystrokes`
+    are typed with send_keys instead.
+    """
+    fields = []
+    for name, value in values.items():
+        by, selector = locators[name].value
+        fields.append([name, by, selector, value, name in keystrokes])
+
+    result = driver.execute_script(FILL_FORM_JS, fields)
+    if result["missing"] or result["invalid"]:
+        raise NoSuchElementException(
+            f"fill_form({locators.__name__}): missing {result['missing']}, invalid option {result['invalid']}"
+        )
+
+    for name, element in result["keystroke"].items():
+        element.send_keys(values[name])
@@ -0,0 +1,155 @@
+import argparse
+import hashlib
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from selenium.webdriver.common.by import By
+import preflight
+
+try:
+    from lxml import etree, html as lxml_html
+except ImportError:  # only the lint needs it, pip install lxml
+    lxml_html = None
+
+# Downloaded pages are kept here between runs, --refresh fetches them again
+CACHE_DIR = os.getenv("LOCATOR_CACHE", ".locator_cache")
+
+# Selenium's own translation of the simple strategies into XPath
+STRATEGY_XPATHS = {
+    By.ID: "//*[@id=$value]",
+    By.NAME: "//*[@name=$value]",
+    By.CLASS_NAME: "//*[contains(concat(' ', normalize-space(@class), ' '), concat(' ', $value, ' '))]",
+}
+
+
+def targets():
+    """[(label, url, [(locator name, by, selector), ...]), ...] for every suite's pages"""
+    import bytes as bytes_suite
+    import misfinal
+    import nextstar
+
+    pages = [
+        (f"misfinal {misfinal.PAGE_TYPES[key]} {country_name}", url, [
+            (name, *misfinal.ElementLocators[name].value)
+            for name in misfinal.PAGE_LOCATORS[misfinal.PAGE_TYPES[key]]
+        ])
+        for key, url_list in misfinal.URLS.items()
+        for country_name, url in url_list
+    ]
+    pages += [
+        (f"bytes {test_name}", url, [(member.name, *member.value) for member in locators])
+        for test_name, url, locators in bytes_suite.URLS
+    ]
+    pages.append(("nextstar Contact Us", nextstar.STARTING_URL, [
+        (selector, By.ID, selector) for selector in nextstar.FORM_MARKERS["ids"]
+    ]))
+    # mis, misnew and mispopup test the same pages with the same locators as misfinal
+    return pages
+
+
+def _cache_path(url):
+    return os.path.join(CACHE_DIR, hashlib.sha1(url.encode()).hexdigest() + ".html")
+
+
+def fetch(urls, refresh=False, offline=False, workers=preflight.WORKERS):
+    """{url: html or None}, from the cache where possible and downloaded concurrently otherwise"""
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    pages = {}
+    missing = []
+    for url in urls:
+        if refresh or not os.path.exists(_cache_path(url)):
+            missing.append(url)
+            continue
+        with open(_cache_path(url), 'r', encoding='utf-8') as f:
+            pages[url] = f.read()
+    if offline:
+        pages.update((url, None) for url in missing)
+        return pages
+
+    session = preflight.http_session(workers)
+
+    def download(url):
+        try:
+            response = session.get(url, timeout=preflight.TIMEOUT)
+            response.raise_for_status()
+        except Exception as e:
+            print(f"  ❌ Could not download {url}: {e}".splitlines()[0])
+            return None
+        with open(_cache_path(url), 'w', encoding='utf-8') as f:
+            f.write(response.text)
+        return response.text
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        pages.update(zip(missing, pool.map(download, missing)))
+    return pages
+
+
+def evaluate(tree, by, selector):
+    """Number of elements the locator matches in the parsed page, None for strategies not linted"""
+    if by in STRATEGY_XPATHS:
+        return len(tree.xpath(STRATEGY_XPATHS[by], value=selector))
+    if by == By.XPATH:
+        result = tree.xpath(selector)
+        return len(result) if isinstance(result, list) else int(bool(result))
+    return None
+
+
+def lint_page(source, locators):
+    """[(locator name, problem), ...] for one page's HTML"""
+    tree = lxml_html.fromstring(source)
+    problems = []
+    for name, by, selector in locators:
+        try:
+            count = evaluate(tree, by, selector)
+        except etree.XPathError as e:
+            problems.append((name, f"invalid XPath {selector!r}: {e}"))
+            continue
+        if count == 0:
+            problems.append((name, f"missing ({by}={selector!r})"))
+        elif count and count > 1:
+            problems.append((name, f"ambiguous, {count} matches ({by}={selector!r})"))
+    return problems
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Check every suite's locators against the pages' HTML without a browser")
+    parser.add_argument("--refresh", action="store_true", help="download every page again instead of using the cache")
+    parser.add_argument("--offline", action="store_true", help="only use cached pages")
+    parser.add_argument("--strict", action="store_true", help="fail on ambiguous locators too")
+    args = parser.parse_args(argv)
+
+    if lxml_html is None:
+        raise SystemExit("locator_lint needs lxml, pip install lxml")
+
+    started = time.perf_counter()
+    pages = targets()
+    sources = fetch({url for _, url, _ in pages}, refresh=args.refresh, offline=args.offline)
+
+    missing = ambiguous = unchecked = 0
+    for label, url, locators in pages:
+        if sources.get(url) is None:
+            print(f"⚠️ {label}: no HTML for {url}")
+            unchecked += 1
+            continue
+        problems = lint_page(sources[url], locators)
+        if not problems:
+            print(f"✅ {label}")
+            continue
+        print(f"❌ {label} - {url}")
+        for name, problem in problems:
+            print(f"    {name}: {problem}")
+            if problem.startswith("ambiguous"):
+                ambiguous += 1
+            else:
+                missing += 1
+
+    print(
+        f"\n{len(pages)} pages in {time.perf_counter() - started:.1f}s: {missing} missing/invalid, "
+        f"{ambiguous} ambiguous, {unchecked} pages without HTML"
+    )
+    # Fields a script adds after load only exist in a browser, run the suite before trusting a "missing"
+    return 1 if missing or unchecked or (args.strict and ambiguous) else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -3,15 +3,33 @@ import os
 import time
 import traceback
 import tempfile
+from concurrent.futures import ProcessPoolExecutor
 from enum import Enum
 from selenium import webdriver
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.chrome.service import Service
-from webdriver_manager.chrome import ChromeDriverManager
+from driver_cache import chromedriver_path
+from email_counter import EmailCounter
+from failure_artifacts import ArtifactWriter
+import failure_artifacts
+import preflight
+from retry_policy import CircuitBreaker, CircuitOpen, RetryPolicy
+import scheduler
+from results_store import ResultsStore
 from selenium.webdriver.common.by import By
-from selenium.webdriver.common.action_chains import ActionChains
-from selenium.webdriver.support.ui import Select, WebDriverWait
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.common.exceptions import TimeoutException
+from step_engine import Steps
+from browser_context import close_tabs, keep_background_tabs_running, new_isolated_context, open_tab
+from form_filler import fill_form
+from network_profile import apply_blocking_profile, profile_for, report_blocked
+import network_capture
+from navigation import activate_lazy_scripts, form_ready, open_form_page, use_eager_loading
+import virtual_time
+from popup_watch import POPUP_SELECTOR, close_popup_if_present, wait_for_popup, watch_popups
+from timeline import Timeline
 from env_sender import smtp_send
+import report_mailer
 from dotenv import load_dotenv
 
 
@@ -113,15 +131,86 @@ URLS = {
     
 }
 
+# Per URL network blocking, every other URL uses its site's profile from network_profile
+BLOCKING_OVERRIDES = {
+    # "https://magnetoitsolutions.com/contact/?qa=test": NO_BLOCKING,
+}
+
+# Desktop user agent for the service page visitor, headless Chrome's default one hides the popup
+INCOGNITO_USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/115.0.0.0 Safari/537.36"
+
+# Report names for each URLS group
+PAGE_TYPES = {
+    "book_consultation": "Book Free Consultation",
+    "contact_us": "Contact Us",
+    "ppc_form": "PPC Form",
+    "service_page_form": "Service Page Form",
+    "hire_form": "Hire Form",
+    "career_page_form": "Career Page Form",
+}
+
+# Locators each page type's form must have, monitor.py checks them without submitting
+COMMON_LOCATORS = ["NAME_FIELD", "EMAIL_FIELD", "PHONE_FIELD"]
+PAGE_LOCATORS = {
+    "Book Free Consultation": COMMON_LOCATORS + [
+        "COMPANY_FIELD", "SERVICE_DROPDOWN", "BUDGET_DROPDOWN", "START_DROPDOWN", "REQUIREMENT_DROPDOWN",
+        "MESSAGE_FIELD", "SUBMIT_BUTTON",
+    ],
+    "Contact Us": COMMON_LOCATORS + [
+        "COMPANY_FIELD", "SERVICE_DROPDOWN", "BUDGET_DROPDOWN", "START_DROPDOWN", "REQUIREMENT_DROPDOWN",
+        "MESSAGE_FIELD", "SUBMIT_BUTTON",
+    ],
+    "PPC Form": COMMON_LOCATORS + ["PPC_SERVICE_DROPDOWN", "PPC_PROJECT_DETAIL", "SUBMIT_BUTTON"],
+    "Service Page Form": COMMON_LOCATORS + ["SERVICE_PROJECT_DETAIL", "SUBMIT_BUTTON"],
+    "Hire Form": COMMON_LOCATORS + ["HIRE_PROJECT_DETAIL", "SUBMIT_BUTTON"],
+    "Career Page Form": [
+        "JOB_NAME", "JOB_EMAIL", "JOB_PHONE", "JOB_GENDER", "JOB_NOTICE_PERIOD", "JOB_LOCATION",
+        "JOB_CURRENT_TITLE", "JOB_TOTAL_EXP", "JOB_RELEVANT_EXP", "JOB_CURRENT_EMPLOYER", "JOB_CURRENT_SALARY",
+        "JOB_EXPECTED_SALARY", "JOB_ADDITIONAL_INFO", "JOB_RESUME_UPLOAD", "JOB_SUBMIT",
+    ],
+}
+
+# MIS_TABS=8 drives up to that many pages of one type at once, in tabs of the same Chrome
+TABS = int(os.getenv("MIS_TABS", "1"))
+
+# Seconds all service popup attempts together may take, POPUP_BUDGET=300 for a slow site
+POPUP_BUDGET = float(os.getenv("POPUP_BUDGET", "120"))
+
+# Pages whose whole flow is load, fill and submit, the service and career pages keep their own
+TAB_PAGE_TYPES = ["Book Free Consultation", "Contact Us", "PPC Form", "Hire Form"]
+
+
+def all_tasks():
+    """Every (page_type, country, url) in URLS"""
+    return [
+        (PAGE_TYPES[key], country_name, url)
+        for key, url_list in URLS.items()
+        for country_name, url in url_list
+    ]
+
+
+def preflight_targets():
+    """{url: markers} for every page in URLS, what its page type's locators need in the raw HTML"""
+    return {
+        url: preflight.markers(ElementLocators, PAGE_LOCATORS[PAGE_TYPES[key]])
+        for key, url_list in URLS.items()
+        for _, url in url_list
+    }
+
 
 class UnifiedAutomation(unittest.TestCase):
     counter_file = "email_counter.txt"
-    passed_urls = []
-    failed_urls = []
+    preflight_failures = None
+    # Shared by every test of the process, an unreachable site is given up on after a few URLs
+    breaker = CircuitBreaker()
 
     @classmethod
     def setUpClass(cls):
         """Setup Chrome driver with headless mode and unique user-data-dir"""
+        # Pages that cannot pass are failed without a browser session, run_parallel checks once for all workers
+        if cls.preflight_failures is None:
+            cls.preflight_failures = preflight.run(preflight_targets())
+
         options = webdriver.ChromeOptions()
 
         # Headless mode for CI/CD or server runs
@@ -135,55 +224,47 @@ class UnifiedAutomation(unittest.TestCase):
         user_data_dir = tempfile.mkdtemp()
         options.add_argument(f"--user-data-dir={user_data_dir}")
 
+        # Performance log feeds the blocked request report
+        network_capture.enable(options)
+        failure_artifacts.enable(options)
+        # Navigation returns at DOMContentLoaded, open_form_page waits for the form itself
+        use_eager_loading(options)
+        if TABS > 1:
+            keep_background_tabs_running(options)
+
         # Initialize Chrome WebDriver
-        cls.driver = webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=options)
+        cls.driver = webdriver.Chrome(service=Service(chromedriver_path()), options=options)
         cls.driver.set_window_size(1920, 1080)
-
-        # Initialize email counter
-        if os.path.exists(cls.counter_file):
-            with open(cls.counter_file, 'r') as f:
-                cls.email_counter = int(f.read().strip())
-        else:
-            cls.email_counter = 1
+        cls.prepare_tab(cls.driver)
+        cls.timeline = Timeline("misfinal")
+        # Screenshot, DOM snapshot and console log of failed pages, written off the test thread
+        cls.artifacts = ArtifactWriter(cls.timeline.run_id)
+        # One record per page outcome, streamed to disk as it happens
+        cls.results = ResultsStore("misfinal")
+
+        # Initialize email counter, numbers come from the shared counter file in locked blocks
+        cls.emails = EmailCounter(cls.counter_file)
+
+    @staticmethod
+    def prepare_tab(driver):
+        """Page scripts every tab needs before its first navigation"""
+        if virtual_time.ENABLED:
+            virtual_time.fast_forward_timers(driver)
+        watch_popups(driver)
+        # Deferred form and popup code runs on DOM ready, no scrolling or mouse moves needed
+        activate_lazy_scripts(driver)
 
     def generate_custom_email(self, base_name="ilfas.mansuri", domain="bytestechnolab.com"):
-        custom_email = f"{base_name}+{self.email_counter}@{domain}"
-        self.email_counter += 1
+        custom_email = f"{base_name}+{self.emails.next()}@{domain}"
         return custom_email
 
     def close_service_popup_if_present(self, timeout=15):
-        """Close popup if it appears on service pages"""
-        try:
-            WebDriverWait(self.driver, timeout).until(
-                EC.visibility_of_element_located((By.CSS_SELECTOR, ".popup_wpr.popup_show"))
-            )
-            print("Popup appeared.")
-            close_btn = WebDriverWait(self.driver, timeout).until(
-                EC.element_to_be_clickable((By.CSS_SELECTOR, "button.close_img_btn"))
-            )
-            close_btn.click()
-            print("Popup closed successfully.")
-            return True
-        except:
-            print("No popup found.")
-            return False
+        """Close popup if it appears on service pages, returns early when none is scheduled"""
+        return close_popup_if_present(self.driver, timeout)
 
     def close_hire_popup_if_present(self, timeout=15):
-        """Close popup if it appears on hire pages"""
-        try:
-            WebDriverWait(self.driver, timeout).until(
-                EC.visibility_of_element_located((By.CSS_SELECTOR, ".popup_wpr.popup_show"))
-            )
-            print("Popup appeared.")
-            close_btn = WebDriverWait(self.driver, timeout).until(
-                EC.element_to_be_clickable((By.CSS_SELECTOR, "button.close_img_btn"))
-            )
-            close_btn.click()
-            print("Popup closed successfully.")
-            return True
-        except:
-            print("No popup found.")
-            return False
+        """Close popup if it appears on hire pages, returns early when none is scheduled"""
+        return close_popup_if_present(self.driver, timeout)
 
     def test_book_consultation(self):
         """Test Book Free Consultation Page"""
@@ -209,252 +290,331 @@ class UnifiedAutomation(unittest.TestCase):
         """Test Career Page Form"""
         self.run_tests(URLS["career_page_form"], "Career Page Form")
 
+    def form_fields(self, page_type):
+        """Field name -> value for the pages in TAB_PAGE_TYPES"""
+        custom_email = self.generate_custom_email()
+        fields = dict(NAME_FIELD="Test Automation", EMAIL_FIELD=custom_email, PHONE_FIELD="9909701409")
+        print(f"Email Entered: {custom_email}")
+
+        if page_type in ["Book Free Consultation", "Contact Us"]:
+            # Extra fields for these forms
+            fields.update(
+                COMPANY_FIELD="Test Company",
+                SERVICE_DROPDOWN=2,
+                BUDGET_DROPDOWN=2,
+                START_DROPDOWN=1,
+                REQUIREMENT_DROPDOWN=2,
+                MESSAGE_FIELD="This is a test automation script running.",
+            )
+
+        elif page_type == "PPC Form":
+            # Fields specific to PPC form
+            fields.update(
+                PPC_SERVICE_DROPDOWN=2,
+                PPC_PROJECT_DETAIL="This is a PPC form automation test project detail.",
+            )
+
+        elif page_type == "Hire Form":
+            fields["HIRE_PROJECT_DETAIL"] = "This is a Hire Page form automation test project detail."
+
+        return fields
+
     def run_tests(self, url_list, page_type):
+        if TABS > 1 and page_type in TAB_PAGE_TYPES and len(url_list) > 1:
+            return self.run_tests_in_tabs(url_list, page_type)
+
         for country_name, url in url_list:
             with self.subTest(country=country_name, page=page_type):
+                started = time.perf_counter()
+                # The service page records its popup and form failures itself, the breaker still hears of them
+                service_error = None
                 try:
                     print(f"Testing {page_type} for {country_name} at {url}")
-                    self.driver.get(url)
-                    time.sleep(5)
+                    preflight.ensure(self.preflight_failures, url)
+                    self.breaker.check(url)
+                    steps = Steps(self.driver, timeline=self.timeline, url=url)
+
+                    # The service page is opened in its own browser context below
+                    if page_type == "Career Page Form":
+                        apply_blocking_profile(self.driver, profile_for(url, BLOCKING_OVERRIDES))
+                        with self.timeline.step("navigation", url):
+                            open_form_page(self.driver, url, ElementLocators, ElementLocators.JOB_NAME, ElementLocators.JOB_SUBMIT)
+                    elif page_type != "Service Page Form":
+                        apply_blocking_profile(self.driver, profile_for(url, BLOCKING_OVERRIDES))
+                        with self.timeline.step("navigation", url):
+                            open_form_page(self.driver, url, ElementLocators)
 
                     # ⬇️ SCROLL WHEN CAREER PAGE IS OPENED
                     if page_type == "Career Page Form":
                         self.driver.execute_script("window.scrollBy(0, 800);")
-                        time.sleep(3)
-
-                    # Fill Common fields
-                    if page_type != "Career Page Form":
-                        self.driver.find_element(*ElementLocators.NAME_FIELD.value).send_keys("Test Automation")
-                        time.sleep(2)
-                        email_field = self.driver.find_element(*ElementLocators.EMAIL_FIELD.value)
-                        custom_email = self.generate_custom_email()
-                        email_field.send_keys(custom_email)
-                        print(f"Email Entered: {custom_email}")
-                        time.sleep(2)
-                        self.driver.find_element(*ElementLocators.PHONE_FIELD.value).send_keys("9909701409")
-                        time.sleep(5)
-
-                    if page_type in ["Book Free Consultation", "Contact Us"]:
-                        # Extra fields for these forms
-                        self.driver.find_element(*ElementLocators.COMPANY_FIELD.value).send_keys("Test Company")
-                        time.sleep(1)
-
-                        Select(self.driver.find_element(*ElementLocators.SERVICE_DROPDOWN.value)).select_by_index(2)
-                        time.sleep(1)
-
-                        Select(self.driver.find_element(*ElementLocators.BUDGET_DROPDOWN.value)).select_by_index(2)
-                        time.sleep(1)
-
-                        Select(self.driver.find_element(*ElementLocators.START_DROPDOWN.value)).select_by_index(1)
-                        time.sleep(1)
-
-                        Select(self.driver.find_element(*ElementLocators.REQUIREMENT_DROPDOWN.value)).select_by_index(2)
-                        time.sleep(1)
-
-                        self.driver.find_element(*ElementLocators.MESSAGE_FIELD.value).send_keys(
-                            "This is a test automation script running."
-                        )
-                        time.sleep(2)
 
-                    elif page_type == "PPC Form":
-                        # Fields specific to PPC form
-                        Select(self.driver.find_element(*ElementLocators.PPC_SERVICE_DROPDOWN.value)).select_by_index(2)
-                        time.sleep(1)
-
-                        self.driver.find_element(*ElementLocators.PPC_PROJECT_DETAIL.value).send_keys(
-                            "This is a PPC form automation test project detail."
-                        )
-                        time.sleep(10)
-
-                    elif page_type == "Service Page Form":
-                        # Clear cookies and cache
-                        self.driver.delete_all_cookies()
-                        try:
-                            self.driver.execute_cdp_cmd('Network.clearBrowserCache', {})
-                            self.driver.execute_cdp_cmd('Network.clearBrowserCookies', {})
-                            print("Cookies and cache cleared.")
-                        except Exception as cache_exc:
-                            print(f"Could not clear cache/cookies: {cache_exc}")
-
-                        # Close browser and open new incognito window
-                        print("Closing browser and opening new incognito window...")
-                        self.driver.quit()
-                        time.sleep(2)
-                        options = webdriver.ChromeOptions()
-                        options.add_argument("--incognito")
-                        options.add_argument("--headless=new")
-                        options.add_argument("--no-sandbox")
-                        options.add_argument("--disable-dev-shm-usage")
-                        options.add_argument("--window-size=1920,1080")
-                        options.add_argument("user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/115.0.0.0 Safari/537.36")
-                        self.driver = webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=options)
-                        # self.driver.maximize_window()
-                        print("New incognito browser opened.")
-
-                        # Reopen the service page URL
-                        self.driver.get(url)
-                        print(f"Reopened URL: {url}")
-                        
-                        # Simulate user interaction to trigger lazy loading
-                        self.driver.execute_script("window.scrollTo(0, 1000);")
-                        time.sleep(2)
-                        self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-                        time.sleep(2)
-                        self.driver.execute_script("window.scrollTo(0, 500);")
-                        
-                        try:
-                            actions = ActionChains(self.driver)
-                            actions.move_by_offset(100, 100).perform()
-                            actions.move_by_offset(100, 100).perform()
-                        except:
-                            pass
-
-                        # Force activate lazyJs if they are still there
-                        lazy_scripts = self.driver.find_elements(By.CSS_SELECTOR, "script[type='lazyJs']")
-                        if len(lazy_scripts) > 0:
-                            self.driver.execute_script("document.dispatchEvent(new Event('mousemove'));")
-                            self.driver.execute_script("document.dispatchEvent(new Event('scroll'));")
-                            self.driver.execute_script("document.dispatchEvent(new Event('touchstart'));")
-
-                        time.sleep(25)  # Wait for popup to appear (20-30s)
-
-                        # Fill popup form with increased wait and retry
-                        popup_found = False
-                        for attempt in range(1, 5):  # Try up to 4 times
-                            try:
-                                WebDriverWait(self.driver, 30 + attempt * 15).until(
-                                    EC.visibility_of_element_located((By.CSS_SELECTOR, ".popup_wpr.popup_show"))
-                                )
-                                print(f"Popup detected on attempt {attempt}. Filling popup form...")
-                                self.driver.find_element(*ElementLocators.POPUP_NAME_FIELD.value).send_keys("Test Automation")
-                                time.sleep(1)
-                                self.driver.find_element(*ElementLocators.POPUP_BUSINESS_EMAIL.value).send_keys("test@yopmail.com")
-                                time.sleep(1)
-                                self.driver.find_element(*ElementLocators.POPUP_PHONE.value).send_keys("9876543210")
-                                time.sleep(1)
-                                self.driver.find_element(*ElementLocators.POPUP_PROJECT_DETAILS.value).send_keys("This is test automation.")
-                                time.sleep(1)
-                                self.driver.find_element(*ElementLocators.POPUP_SUBMIT_BUTTON.value).click()
-                                print("Popup form submitted successfully.")
-                                
-                                # Wait for popup to close
+                    # Field name -> value, filled in one batch once the page specific steps are done
+                    fields = {}
+
+                    # Common and page fields (the service and career pages fill their own below)
+                    if page_type in TAB_PAGE_TYPES:
+                        fields.update(self.form_fields(page_type))
+
+                    if page_type == "Service Page Form":
+                        # Fresh visitor state in a new browser context instead of relaunching Chrome
+                        print("Opening isolated browser context...")
+                        # Failures are captured on the way out of the block, before its tab closes
+                        with new_isolated_context(self.driver, user_agent=INCOGNITO_USER_AGENT), \
+                                self.artifacts.capturing(self.driver, f"{country_name} - {page_type}", url):
+                            print("Isolated browser context opened.")
+                            apply_blocking_profile(self.driver, profile_for(url, BLOCKING_OVERRIDES))
+                            self.prepare_tab(self.driver)
+
+                            # Reopen the service page URL
+                            with self.timeline.step("navigation", url):
+                                self.driver.get(url)
+                            print(f"Reopened URL: {url}")
+
+                            # Fill popup form with increased wait and retry (popup appears after 20-30s),
+                            # all attempts and backoffs together stay within POPUP_BUDGET
+                            popup_found = False
+                            popup_error = None
+                            popup_retry = RetryPolicy(attempts=4, budget=POPUP_BUDGET)
+                            for attempt in popup_retry:
                                 try:
-                                    WebDriverWait(self.driver, 15).until(
-                                        EC.invisibility_of_element_located((By.CSS_SELECTOR, ".popup_wpr.popup_show"))
-                                    )
-                                    print("Popup closed.")
-                                except:
-                                    print("Popup did not close automatically, attempting to close manually...")
+                                    wait = popup_retry.timeout(30 + attempt * 15)
+                                    with self.timeline.step("wait", url, "service popup"):
+                                        popup_state = wait_for_popup(self.driver, wait)
+                                    if popup_state == "not scheduled":
+                                        print("Page loaded without scheduling the popup, not retrying.")
+                                        break
+                                    if popup_state != "shown":
+                                        raise TimeoutException(f"popup still {popup_state} after {wait:.0f}s")
+                                    print(f"Popup detected on attempt {attempt}. Filling popup form...")
+                                    with self.timeline.step("fill", url, "popup form"):
+                                        fill_form(self.driver, ElementLocators, {
+                                            "POPUP_NAME_FIELD": "Test Automation",
+                                            "POPUP_BUSINESS_EMAIL": "test@yopmail.com",
+                                            "POPUP_PHONE": "9876543210",
+                                            "POPUP_PROJECT_DETAILS": "This is test automation.",
+                                        })
+                                    response = steps.submit_confirmed(ElementLocators.POPUP_SUBMIT_BUTTON.value)
+                                    print(f"Popup form submitted, answered {response['status']} in {response['latency']:.2f}s")
+                                
+                                    # Wait for popup to close
                                     try:
-                                        self.driver.find_element(By.CSS_SELECTOR, "button.close_img_btn").click()
+                                        with self.timeline.step("wait", url, "popup close"):
+                                            WebDriverWait(self.driver, 15).until(
+                                                EC.invisibility_of_element_located((By.CSS_SELECTOR, POPUP_SELECTOR))
+                                            )
+                                        print("Popup closed.")
                                     except:
-                                        pass
+                                        print("Popup did not close automatically, attempting to close manually...")
+                                        try:
+                                            self.driver.find_element(By.CSS_SELECTOR, "button.close_img_btn").click()
+                                        except:
+                                            pass
+
+                                    popup_found = True
+                                    self.results.passed(
+                                        "Service Popup", url, country=country_name, duration=time.perf_counter() - started
+                                    )
+                                    break
+                                except Exception as e:
+                                    popup_error = e
+                                    print(f"Attempt {attempt}: Popup not found or error filling popup: {e}")
+                                    if attempt < popup_retry.attempts:
+                                        with self.timeline.step("wait", url, "popup retry backoff"):
+                                            popup_retry.backoff(attempt)
+                            if not popup_found:
+                                service_error = popup_error
+                                print("Popup did not appear after maximum wait time.")
+                                artifacts = self.artifacts.capture(self.driver, f"{country_name} - Service Popup", url)
+                                self.results.failed(
+                                    "Service Popup", url, country=country_name, duration=time.perf_counter() - started,
+                                    error="popup did not appear", artifacts=artifacts,
+                                )
 
-                                time.sleep(2)
-                                popup_found = True
-                                self.passed_urls.append(f"✅ Popup Form Submitted - {url}")
-                                break
+                            # Fill all required fields in service page form after popup
+                            try:
+                                name_field = steps.ready(ElementLocators.NAME_FIELD.value)
+                                self.driver.execute_script("arguments[0].scrollIntoView(true);", name_field)
+                                custom_email = self.generate_custom_email()
+                                with self.timeline.step("fill", url, "service form"):
+                                    fill_form(self.driver, ElementLocators, {
+                                        "NAME_FIELD": "Test Automation",
+                                        "EMAIL_FIELD": custom_email,
+                                        "PHONE_FIELD": "9909701409",
+                                        "SERVICE_PROJECT_DETAIL": "This is a Service Page form automation test project detail.",
+                                    })
+                                print(f"Email Entered: {custom_email}")
+                                self.results.passed(
+                                    page_type, url, country=country_name, duration=time.perf_counter() - started
+                                )
                             except Exception as e:
-                                print(f"Attempt {attempt}: Popup not found or error filling popup: {e}")
-                                time.sleep(10)
-                        if not popup_found:
-                            print("Popup did not appear after maximum wait time.")
-                            self.failed_urls.append(f"❌ Popup Form Failed - {url}")
-
-                        # Fill all required fields in service page form after popup
-                        try:
-                            name_field = self.driver.find_element(*ElementLocators.NAME_FIELD.value)
-                            self.driver.execute_script("arguments[0].scrollIntoView(true);", name_field)
-                            time.sleep(1)
-                            name_field.send_keys("Test Automation")
-                            time.sleep(1)
-                            email_field = self.driver.find_element(*ElementLocators.EMAIL_FIELD.value)
-                            custom_email = self.generate_custom_email()
-                            email_field.send_keys(custom_email)
-                            print(f"Email Entered: {custom_email}")
-                            time.sleep(1)
-                            self.driver.find_element(*ElementLocators.PHONE_FIELD.value).send_keys("9909701409")
-                            time.sleep(1)
-                            self.driver.find_element(*ElementLocators.SERVICE_PROJECT_DETAIL.value).send_keys(
-                                "This is a Service Page form automation test project detail."
-                            )
-                            time.sleep(1)
-                            self.passed_urls.append(f"✅ {country_name} - Service Page Form - {url}")
-                        except Exception as e:
-                            print(f"Error filling service page form after popup: {e}")
-                            self.failed_urls.append(f"❌ {country_name} - Service Page Form Failed - {url}")
-                        
-                        time.sleep(15)
+                                service_error = e
+                                print(f"Error filling service page form after popup: {e}")
+                                artifacts = self.artifacts.capture(self.driver, f"{country_name} - Service Page Form", url)
+                                self.results.failed(
+                                    page_type, url, country=country_name, duration=time.perf_counter() - started,
+                                    error=e, artifacts=artifacts,
+                                )
 
                     elif page_type == "Hire Form":
-                        self.close_hire_popup_if_present(timeout=15)
-                        time.sleep(5)
-                        self.driver.find_element(*ElementLocators.HIRE_PROJECT_DETAIL.value).send_keys(
-                            "This is a Hire Page form automation test project detail."
-                        )
-                        time.sleep(2)
+                        with self.timeline.step("wait", url, "hire popup"):
+                            self.close_hire_popup_if_present(timeout=15)
 
                     elif page_type == "Career Page Form":
                         # 🔹 Career form full filling logic
-                        self.driver.find_element(*ElementLocators.JOB_NAME.value).send_keys("Test Candidate")
-                        time.sleep(3)
-                        email_field = self.driver.find_element(*ElementLocators.JOB_EMAIL.value)
-                        custom_email = self.generate_custom_email()
-                        email_field.send_keys(custom_email)
-                        time.sleep(3)
-                        self.driver.find_element(*ElementLocators.JOB_PHONE.value).send_keys("9909701409")
-                        time.sleep(3)
-                        Select(self.driver.find_element(*ElementLocators.JOB_GENDER.value)).select_by_index(1)
-                        time.sleep(3)
-                        self.driver.find_element(*ElementLocators.JOB_NOTICE_PERIOD.value).send_keys("30")
-                        time.sleep(3)
-                        self.driver.find_element(*ElementLocators.JOB_LOCATION.value).send_keys("Ahmedabad")
-                        time.sleep(3)
-                        self.driver.find_element(*ElementLocators.JOB_CURRENT_TITLE.value).send_keys("QA Engineer")
-                        time.sleep(3)
-                        self.driver.find_element(*ElementLocators.JOB_TOTAL_EXP.value).send_keys("2")
-                        time.sleep(3)
-                        self.driver.find_element(*ElementLocators.JOB_RELEVANT_EXP.value).send_keys("2")
-                        time.sleep(3)
-                        self.driver.find_element(*ElementLocators.JOB_CURRENT_EMPLOYER.value).send_keys("TechCorp Pvt Ltd")
-                        time.sleep(3)
-                        self.driver.find_element(*ElementLocators.JOB_CURRENT_SALARY.value).send_keys("4")
-                        time.sleep(3)                    
-                        self.driver.find_element(*ElementLocators.JOB_EXPECTED_SALARY.value).send_keys("6")
-                        time.sleep(3)
-                        self.driver.find_element(*ElementLocators.JOB_ADDITIONAL_INFO.value).send_keys("Ready to join immediately.")
-                        # self.driver.find_element(*ElementLocators.JOB_RESUME_UPLOAD.value).click()
-                        time.sleep(3)
+                        fields.update(
+                            JOB_NAME="Test Candidate",
+                            JOB_EMAIL=self.generate_custom_email(),
+                            JOB_PHONE="9909701409",
+                            JOB_GENDER=1,
+                            JOB_NOTICE_PERIOD="30",
+                            JOB_LOCATION="Ahmedabad",
+                            JOB_CURRENT_TITLE="QA Engineer",
+                            JOB_TOTAL_EXP="2",
+                            JOB_RELEVANT_EXP="2",
+                            JOB_CURRENT_EMPLOYER="TechCorp Pvt Ltd",
+                            JOB_CURRENT_SALARY="4",
+                            JOB_EXPECTED_SALARY="6",
+                            JOB_ADDITIONAL_INFO="Ready to join immediately.",
+                        )
+
+                    if fields:
+                        steps.ready(ElementLocators[next(iter(fields))].value)
+                        with self.timeline.step("fill", url, "form"):
+                            fill_form(self.driver, ElementLocators, fields)
+
+                    if page_type == "Career Page Form":
                         resume_path = "/home/rutvik/Documents/Fake-Resume.pdf"
-                        time.sleep(3)
-                        self.driver.find_element(*ElementLocators.JOB_RESUME_UPLOAD.value).send_keys(resume_path)
-                        time.sleep(3)
-                        self.driver.find_element(*ElementLocators.JOB_SUBMIT.value).click()
-                        time.sleep(5)
+                        with self.timeline.step("fill", url, "resume"):
+                            self.driver.find_element(*ElementLocators.JOB_RESUME_UPLOAD.value).send_keys(resume_path)
+                        response = steps.submit_confirmed(ElementLocators.JOB_SUBMIT.value)
+                        print(f"Submission answered {response['status']} in {response['latency']:.2f}s")
 
                     if page_type != "Career Page Form" and page_type != "Service Page Form":
-                        submit_btn = self.driver.find_element(*ElementLocators.SUBMIT_BUTTON.value)
-                        self.driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", submit_btn)
-                        time.sleep(2)
-                        submit_btn.click()
-                    time.sleep(10)
+                        response = steps.submit_confirmed(ElementLocators.SUBMIT_BUTTON.value)
+                        print(f"Submission answered {response['status']} in {response['latency']:.2f}s")
 
                     # Skip adding general entry for Service Page Form as it's already tracked separately
                     if page_type != "Service Page Form":
-                        self.passed_urls.append(f"✅ {country_name} - {page_type} - {url}")
+                        self.results.passed(page_type, url, country=country_name, duration=time.perf_counter() - started)
+                    self.breaker.record(url, service_error)
 
                 except Exception as e:
                     error_msg = traceback.format_exc().splitlines()[-1]
                     print(f"Error: {e}")
                     traceback.print_exc()
-                    self.failed_urls.append(f"❌ {country_name} - {page_type} - {url}")
+                    artifacts = None
+                    # Pages skipped before loading have nothing to capture and say nothing about the site
+                    if not isinstance(e, (preflight.PreflightFailed, CircuitOpen)):
+                        artifacts = getattr(e, "artifacts", None)
+                        if artifacts is None:
+                            artifacts = self.artifacts.capture(self.driver, f"{country_name} - {page_type}", url)
+                        self.breaker.record(url, e)
+                    self.results.failed(
+                        page_type, url, country=country_name, duration=time.perf_counter() - started,
+                        error=error_msg, artifacts=artifacts,
+                    )
+                finally:
+                    report_blocked(self.driver, url)
+
+    def run_tests_in_tabs(self, url_list, page_type):
+        """
+        Run up to TABS pages of one type at once in tabs of this Chrome: every tab starts loading
+        before the first is filled, and every form is submitted before the first response is
+        awaited, so page loads and server round trips overlap while commands stay serial.
+        """
+        main_handle = self.driver.current_window_handle
+        # A tab for a page that failed its preflight would only abort the whole batch
+        for country_name, url in url_list:
+            if url in self.preflight_failures:
+                print(f"Skipping {page_type} for {country_name} at {url}: {self.preflight_failures[url]}")
+                self.results.failed(
+                    page_type, url, country=country_name, error=f"preflight: {self.preflight_failures[url]}"
+                )
+        url_list = [(country_name, url) for country_name, url in url_list if url not in self.preflight_failures]
+        for start in range(0, len(url_list), TABS):
+            tabs = []
+            try:
+                for country_name, url in url_list[start:start + TABS]:
+                    print(f"Testing {page_type} for {country_name} at {url} (tab)")
+                    try:
+                        self.breaker.check(url)
+                    except CircuitOpen as e:
+                        print(f"Skipping: {e}")
+                        self.results.failed(page_type, url, country=country_name, error=e)
+                        continue
+
+                    def prepare(driver, url=url):
+                        apply_blocking_profile(driver, profile_for(url, BLOCKING_OVERRIDES))
+                        self.prepare_tab(driver)
+                    handle = open_tab(self.driver, url, prepare)
+                    tabs.append({
+                        "country": country_name, "url": url, "handle": handle, "pending": None,
+                        "started": time.perf_counter(),
+                    })
+
+                # Fill and submit every tab without waiting for the responses
+                for tab in tabs:
+                    with self.subTest(country=tab["country"], page=page_type):
+                        steps = Steps(self.driver, timeline=self.timeline, url=tab["url"])
+                        try:
+                            self.driver.switch_to.window(tab["handle"])
+                            with self.timeline.step("navigation", tab["url"]):
+                                steps.wait(
+                                    form_ready(ElementLocators.NAME_FIELD.value, ElementLocators.SUBMIT_BUTTON.value),
+                                    30, f"form not ready on {tab['url']}"
+                                )
+                            if page_type == "Hire Form":
+                                with self.timeline.step("wait", tab["url"], "hire popup"):
+                                    self.close_hire_popup_if_present(timeout=15)
+                            with self.timeline.step("fill", tab["url"], "form"):
+                                fill_form(self.driver, ElementLocators, self.form_fields(page_type))
+                            tab["pending"] = steps.start_submission(ElementLocators.SUBMIT_BUTTON.value)
+                        except Exception as e:
+                            print(f"Error: {e}")
+                            traceback.print_exc()
+                            self.breaker.record(tab["url"], e)
+                            artifacts = self.artifacts.capture(self.driver, f"{tab['country']} - {page_type}", tab["url"])
+                            self.results.failed(
+                                page_type, tab["url"], country=tab["country"],
+                                duration=time.perf_counter() - tab["started"], error=e, artifacts=artifacts,
+                            )
+
+                # Collect the responses, any tab's events can be read from here
+                for tab in tabs:
+                    if tab["pending"] is None:
+                        continue
+                    with self.subTest(country=tab["country"], page=page_type):
+                        steps = Steps(self.driver, timeline=self.timeline, url=tab["url"])
+                        try:
+                            # Only to screenshot the right tab on failure, events are read from any tab
+                            self.driver.switch_to.window(tab["handle"])
+                            with self.timeline.step("submit", tab["url"], "response"):
+                                response = steps.confirm_submission(tab["pending"])
+                            print(f"Submission answered {response['status']} in {response['latency']:.2f}s")
+                            self.results.passed(
+                                page_type, tab["url"], country=tab["country"], duration=time.perf_counter() - tab["started"]
+                            )
+                            self.breaker.record(tab["url"])
+                        except Exception as e:
+                            print(f"Error: {e}")
+                            self.breaker.record(tab["url"], e)
+                            artifacts = self.artifacts.capture(self.driver, f"{tab['country']} - {page_type}", tab["url"])
+                            self.results.failed(
+                                page_type, tab["url"], country=tab["country"],
+                                duration=time.perf_counter() - tab["started"], error=e, artifacts=artifacts,
+                            )
+            finally:
+                close_tabs(self.driver, [tab["handle"] for tab in tabs], main_handle)
+                report_blocked(self.driver, f"{len(tabs)} {page_type} tabs")
 
     @classmethod
     def tearDownClass(cls):
         """Cleanup driver and send report"""
-        with open(cls.counter_file, 'w') as f:
-            f.write(str(cls.email_counter))
+        cls.emails.release()
         cls.driver.quit()
+        cls.artifacts.close()
+        print(f"Timeline written to {cls.timeline.save()}")
+        cls.timeline.print_summary()
         cls.send_email_report()
 
     @classmethod
@@ -468,16 +628,18 @@ class UnifiedAutomation(unittest.TestCase):
         <h3>Test Report</h3>
         <p><b>Passed Tests:</b></p>
         <ul>
-            {''.join(f"<li>{test}</li>" for test in cls.passed_urls)}
+            {''.join(f"<li>{line}</li>" for line in cls.results.lines("passed"))}
         </ul>
 
         <p><b>Failed Tests:</b></p>
         <ul>
-            {''.join(f"<li>{test}</li>" for test in cls.failed_urls) if cls.failed_urls else "<li>No test failures 🎉</li>"}
+            {''.join(f"<li>{line}</li>" for line in cls.results.lines("failed")) or "<li>No test failures 🎉</li>"}
         </ul>
         """
 
-        smtp_send(
+        # Delivered from a background thread together with every other suite's report of this run
+        report_mailer.send(
+            smtp_send,
             sender_email=sender_email,
             receiver_email=receiver_email,
             cc_email=cc_email,
@@ -485,8 +647,71 @@ class UnifiedAutomation(unittest.TestCase):
             password=password,
             email_body=email_body
         )
-        print("Email Sent Successfully!")
+        print("Email report queued.")
+
+
+def _run_shard(shard):
+    """
+    Run one worker's share of the URL matrix in its own Chrome instance, results go to RESULTS_FILE.
+    Returns the timeline steps and the seconds the shard took, Chrome start included.
+    """
+    started = time.perf_counter()
+    # The parent already preflighted and only dispatched pages that passed
+    UnifiedAutomation.preflight_failures = {}
+    UnifiedAutomation.setUpClass()
+    try:
+        for page_type, country_name, url in shard:
+            case = UnifiedAutomation()
+            case.run_tests([(country_name, url)], page_type)
+    finally:
+        UnifiedAutomation.emails.release()
+        UnifiedAutomation.driver.quit()
+        UnifiedAutomation.artifacts.close()
+    return UnifiedAutomation.timeline.steps, time.perf_counter() - started
+
+
+def run_parallel(workers=4):
+    """Fan every (page_type, country, url) in URLS out to N isolated Chrome workers"""
+    tasks = all_tasks()
+
+    # One preflight for every worker, pages that cannot pass never reach a Chrome
+    failures = preflight.run(preflight_targets())
+    results = ResultsStore("misfinal")
+    for page_type, country_name, url in tasks:
+        if url in failures:
+            results.failed(page_type, url, country=country_name, error=f"preflight: {failures[url]}")
+    tasks = [task for task in tasks if task[2] not in failures]
+
+    # Longest pages first, each to the least loaded worker, from the durations of earlier runs.
+    # Workers reserve their own blocks of email numbers from the shared counter file.
+    estimate = scheduler.estimator(scheduler.load_durations(), tasks)
+    shards, predicted = scheduler.longest_first(tasks, workers, estimate)
+    scheduler.print_plan(shards, predicted, estimate)
+    busy = [index for index, shard in enumerate(shards) if shard]
+
+    # Every worker appends its records to the same file as they happen
+    os.environ["RESULTS_FILE"] = results.path
+    timeline = Timeline("misfinal")
+    actual = []
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for steps, elapsed in pool.map(_run_shard, [shards[index] for index in busy]):
+            timeline.steps.extend(steps)
+            actual.append(elapsed)
+    scheduler.print_makespan([predicted[index] for index in busy], actual)
+
+    print(f"Timeline written to {timeline.save()}")
+    timeline.print_summary()
+
+    UnifiedAutomation.results = results
+    UnifiedAutomation.send_email_report()
+    return results
 
 
 if __name__ == "__main__":
-    unittest.main()
\ No newline at end of file
+    # MIS_WORKERS=4 python misfinal.py runs the whole URLS matrix in parallel,
+    # MIS_TABS=8 python misfinal.py runs each page type's URLs in tabs of one Chrome
+    workers = int(os.getenv("MIS_WORKERS", "1"))
+    if workers > 1:
+        run_parallel(workers)
+    else:
+        unittest.main()
\ No newline at end of file
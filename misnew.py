@@ -1,15 +1,21 @@
 import unittest
 import os
-import time
 import traceback
+import time
 from enum import Enum
 from selenium import webdriver
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.chrome.service import Service
-from webdriver_manager.chrome import ChromeDriverManager
+from driver_cache import chromedriver_path
+from email_counter import EmailCounter
+import preflight
+from results_store import ResultsStore
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import Select, WebDriverWait
+from selenium.webdriver.support.ui import WebDriverWait
+from step_engine import Steps
+from navigation import open_form_page, use_eager_loading
 from env_sender import smtp_send
+import report_mailer
 from dotenv import load_dotenv
 
 
@@ -86,27 +92,31 @@ URLS = {
 
 class UnifiedAutomation(unittest.TestCase):
     counter_file = "email_counter.txt"
-    passed_urls = []
-    failed_urls = []
 
     @classmethod
     def setUpClass(cls):
+        # Pages that cannot pass are failed without a browser session
+        cls.preflight_failures = preflight.run({
+            url: preflight.markers(ElementLocators, preflight.MIS_LOCATORS)
+            for url_list in URLS.values()
+            for _, url in url_list
+        })
+
         options = webdriver.ChromeOptions()
         # options.add_argument("--headless")
         options.add_argument("--no-sandbox")
         options.add_argument("--disable-dev-shm-usage")
-        cls.driver = webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=options)
+        use_eager_loading(options)
+        cls.driver = webdriver.Chrome(service=Service(chromedriver_path()), options=options)
         cls.driver.maximize_window()
 
-        if os.path.exists(cls.counter_file):
-            with open(cls.counter_file, 'r') as f:
-                cls.email_counter = int(f.read().strip())
-        else:
-            cls.email_counter = 1
+        # Address numbers come from the shared counter file in locked blocks
+        cls.emails = EmailCounter(cls.counter_file)
+
+        cls.results = ResultsStore("misnew")
 
     def generate_custom_email(self, base_name="ilfas.mansuri", domain="bytestechnolab.com"):
-        custom_email = f"{base_name}+{self.email_counter}@{domain}"
-        self.email_counter += 1
+        custom_email = f"{base_name}+{self.emails.next()}@{domain}"
         return custom_email
 
     def close_service_popup_if_present(self, timeout=15):
@@ -168,89 +178,67 @@ class UnifiedAutomation(unittest.TestCase):
     def run_tests(self, url_list, page_type):
         for country_name, url in url_list:
             with self.subTest(country=country_name, page=page_type):
+                started = time.perf_counter()
                 try:
                     print(f"Testing {page_type} for {country_name} at {url}")
-                    self.driver.get(url)
-                    time.sleep(5)
+                    preflight.ensure(self.preflight_failures, url)
+                    open_form_page(self.driver, url, ElementLocators)
+                    steps = Steps(self.driver)
 
                     # Fill Common fields
-                    self.driver.find_element(*ElementLocators.NAME_FIELD.value).send_keys("Test Automation")
-                    time.sleep(2)
-                    email_field = self.driver.find_element(*ElementLocators.EMAIL_FIELD.value)
+                    steps.type(ElementLocators.NAME_FIELD.value, "Test Automation")
                     custom_email = self.generate_custom_email()
-                    email_field.send_keys(custom_email)
+                    steps.type(ElementLocators.EMAIL_FIELD.value, custom_email)
                     print(f"Email Entered: {custom_email}")
-                    time.sleep(2)
-                    self.driver.find_element(*ElementLocators.PHONE_FIELD.value).send_keys("9909701409")
-                    time.sleep(5)
+                    steps.type(ElementLocators.PHONE_FIELD.value, "9909701409")
 
                     if page_type in ["Book Free Consultation", "Contact Us"]:
                         # Extra fields for these forms
-                        self.driver.find_element(*ElementLocators.COMPANY_FIELD.value).send_keys("Test Company")
-                        time.sleep(1)
-
-                        Select(self.driver.find_element(*ElementLocators.SERVICE_DROPDOWN.value)).select_by_index(2)
-                        time.sleep(1)
-
-                        Select(self.driver.find_element(*ElementLocators.BUDGET_DROPDOWN.value)).select_by_index(2)
-                        time.sleep(1)
-
-                        Select(self.driver.find_element(*ElementLocators.START_DROPDOWN.value)).select_by_index(1)
-                        time.sleep(1)
-
-                        Select(self.driver.find_element(*ElementLocators.REQUIREMENT_DROPDOWN.value)).select_by_index(2)
-                        time.sleep(1)
-
-                        self.driver.find_element(*ElementLocators.MESSAGE_FIELD.value).send_keys(
-                            "This is a test automation script running."
-                        )
-                        time.sleep(2)
+                        steps.type(ElementLocators.COMPANY_FIELD.value, "Test Company")
+                        steps.select(ElementLocators.SERVICE_DROPDOWN.value, 2)
+                        steps.select(ElementLocators.BUDGET_DROPDOWN.value, 2)
+                        steps.select(ElementLocators.START_DROPDOWN.value, 1)
+                        steps.select(ElementLocators.REQUIREMENT_DROPDOWN.value, 2)
+                        steps.type(ElementLocators.MESSAGE_FIELD.value, "This is a test automation script running.")
 
                     elif page_type == "PPC Form":
                         # Fields specific to PPC form
-                        Select(self.driver.find_element(*ElementLocators.PPC_SERVICE_DROPDOWN.value)).select_by_index(2)
-                        time.sleep(1)
-
-                        self.driver.find_element(*ElementLocators.PPC_PROJECT_DETAIL.value).send_keys(
+                        steps.select(ElementLocators.PPC_SERVICE_DROPDOWN.value, 2)
+                        steps.type(
+                            ElementLocators.PPC_PROJECT_DETAIL.value,
                             "This is a PPC form automation test project detail."
                         )
-                        time.sleep(10)
 
                     elif page_type == "Service Page Form":
                         # Close popup if present
                         self.close_service_popup_if_present(timeout=15)
-                        time.sleep(5)
                         # Fill project details
-                        self.driver.find_element(*ElementLocators.SERVICE_PROJECT_DETAIL.value).send_keys(
+                        steps.type(
+                            ElementLocators.SERVICE_PROJECT_DETAIL.value,
                             "This is a Service Page form automation test project detail."
                         )
-                        time.sleep(10)
 
                     elif page_type == "Hire Form":
                         self.close_hire_popup_if_present(timeout=15)
-                        time.sleep(5)
-                        self.driver.find_element(*ElementLocators.HIRE_PROJECT_DETAIL.value).send_keys(
+                        steps.type(
+                            ElementLocators.HIRE_PROJECT_DETAIL.value,
                             "This is a Hire Page form automation test project detail."
                         )
-                        time.sleep(2)
-
-                    self.driver.execute_script("window.scrollBy(0, 500);")
-                    time.sleep(2)
 
-                    self.driver.find_element(*ElementLocators.SUBMIT_BUTTON.value).click()
-                    time.sleep(5)
+                    steps.submit(ElementLocators.SUBMIT_BUTTON.value)
 
-                    self.passed_urls.append(f"✅ {country_name} - {page_type} - {url}")
+                    self.results.passed(page_type, url, country=country_name, duration=time.perf_counter() - started)
 
                 except Exception as e:
                     error_msg = traceback.format_exc().splitlines()[-1]
                     print(f"Error: {error_msg}")
-                    self.failed_urls.append(f"❌ {country_name} - {page_type} - {url}")
+                    self.results.failed(
+                        page_type, url, country=country_name, duration=time.perf_counter() - started, error=error_msg
+                    )
 
     @classmethod
     def tearDownClass(cls):
-        with open(cls.counter_file, 'w') as f:
-            f.write(str(cls.email_counter))
+        cls.emails.release()
         cls.driver.quit()
         cls.send_email_report()
 
@@ -266,16 +254,17 @@ class UnifiedAutomation(unittest.TestCase):
         <h3>Test Report</h3>
         <p><b>Passed Tests:</b></p>
         <ul>
-            {''.join(f"<li>{test}</li>" for test in cls.passed_urls)}
+            {''.join(f"<li>{line}</li>" for line in cls.results.lines("passed"))}
         </ul>
 
         <p><b>Failed Tests:</b></p>
         <ul>
-            {''.join(f"<li>{test}</li>" for test in cls.failed_urls) if cls.failed_urls else "<li>No test failures 🎉</li>"}
+            {''.join(f"<li>{line}</li>" for line in cls.results.lines("failed")) or "<li>No test failures 🎉</li>"}
         </ul>
         """
 
-        smtp_send(
+        report_mailer.send(
+            smtp_send,
             sender_email=sender_email,
             receiver_email=receiver_email,
             cc_email=cc_email,
@@ -283,7 +272,7 @@ class UnifiedAutomation(unittest.TestCase):
             password=password,
             email_body=email_body
         )
-        print("Email Sent Successfully!")
+        print("Email report queued.")
 
 
 if __name__ == "__main__":
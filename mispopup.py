@@ -5,12 +5,18 @@ import traceback
 import tempfile
 from enum import Enum
 from selenium import webdriver
-from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.chrome.service import Service
-from webdriver_manager.chrome import ChromeDriverManager
+from driver_cache import chromedriver_path
+from email_counter import EmailCounter
+import preflight
+from results_store import ResultsStore
+import virtual_time
+from popup_watch import close_popup_if_present, wait_for_popup, watch_popups
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import Select, WebDriverWait
+from selenium.webdriver.support.ui import Select
+from selenium.common.exceptions import TimeoutException
 from env_sender import smtp_send
+import report_mailer
 from dotenv import load_dotenv
 
 
@@ -94,12 +100,17 @@ URLS = {
 
 class UnifiedAutomation(unittest.TestCase):
     counter_file = "email_counter.txt"
-    passed_urls = []
-    failed_urls = []
 
     @classmethod
     def setUpClass(cls):
         """Setup Chrome driver with headless mode and unique user-data-dir"""
+        # Pages that cannot pass are failed without a browser session
+        cls.preflight_failures = preflight.run({
+            url: preflight.markers(ElementLocators, preflight.MIS_LOCATORS)
+            for url_list in URLS.values()
+            for _, url in url_list
+        })
+
         options = webdriver.ChromeOptions()
 
         # Headless mode for CI/CD or server runs
@@ -114,54 +125,28 @@ class UnifiedAutomation(unittest.TestCase):
         options.add_argument(f"--user-data-dir={user_data_dir}")
 
         # Initialize Chrome WebDriver
-        cls.driver = webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=options)
+        cls.driver = webdriver.Chrome(service=Service(chromedriver_path()), options=options)
         cls.driver.set_window_size(1920, 1080)
+        if virtual_time.ENABLED:
+            virtual_time.fast_forward_timers(cls.driver)
+        watch_popups(cls.driver)
+
+        # Initialize email counter, numbers come from the shared counter file in locked blocks
+        cls.emails = EmailCounter(cls.counter_file)
 
-        # Initialize email counter
-        if os.path.exists(cls.counter_file):
-            with open(cls.counter_file, 'r') as f:
-                cls.email_counter = int(f.read().strip())
-        else:
-            cls.email_counter = 1
+        cls.results = ResultsStore("mispopup")
 
     def generate_custom_email(self, base_name="ilfas.mansuri", domain="bytestechnolab.com"):
-        custom_email = f"{base_name}+{self.email_counter}@{domain}"
-        self.email_counter += 1
+        custom_email = f"{base_name}+{self.emails.next()}@{domain}"
         return custom_email
 
     def close_service_popup_if_present(self, timeout=15):
-        """Close popup if it appears on service pages"""
-        try:
-            WebDriverWait(self.driver, timeout).until(
-                EC.visibility_of_element_located((By.CSS_SELECTOR, ".popup_wpr.popup_show"))
-            )
-            print("Popup appeared.")
-            close_btn = WebDriverWait(self.driver, timeout).until(
-                EC.element_to_be_clickable((By.CSS_SELECTOR, "button.close_img_btn"))
-            )
-            close_btn.click()
-            print("Popup closed successfully.")
-            return True
-        except:
-            print("No popup found.")
-            return False
+        """Close popup if it appears on service pages, returns early when none is scheduled"""
+        return close_popup_if_present(self.driver, timeout)
 
     def close_hire_popup_if_present(self, timeout=15):
-        """Close popup if it appears on hire pages"""
-        try:
-            WebDriverWait(self.driver, timeout).until(
-                EC.visibility_of_element_located((By.CSS_SELECTOR, ".popup_wpr.popup_show"))
-            )
-            print("Popup appeared.")
-            close_btn = WebDriverWait(self.driver, timeout).until(
-                EC.element_to_be_clickable((By.CSS_SELECTOR, "button.close_img_btn"))
-            )
-            close_btn.click()
-            print("Popup closed successfully.")
-            return True
-        except:
-            print("No popup found.")
-            return False
+        """Close popup if it appears on hire pages, returns early when none is scheduled"""
+        return close_popup_if_present(self.driver, timeout)
 
     def test_book_consultation(self):
         """Test Book Free Consultation Page"""
@@ -186,8 +171,10 @@ class UnifiedAutomation(unittest.TestCase):
     def run_tests(self, url_list, page_type):
         for country_name, url in url_list:
             with self.subTest(country=country_name, page=page_type):
+                started = time.perf_counter()
                 try:
                     print(f"Testing {page_type} for {country_name} at {url}")
+                    preflight.ensure(self.preflight_failures, url)
                     self.driver.get(url)
                     time.sleep(5)
 
@@ -253,22 +240,28 @@ class UnifiedAutomation(unittest.TestCase):
                         options.add_argument("--no-sandbox")
                         options.add_argument("--disable-dev-shm-usage")
                         options.add_argument("--window-size=1920,1080")
-                        self.driver = webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=options)
+                        self.driver = webdriver.Chrome(service=Service(chromedriver_path()), options=options)
                         self.driver.maximize_window()
+                        if virtual_time.ENABLED:
+                            virtual_time.fast_forward_timers(self.driver)
+                        watch_popups(self.driver)
                         print("New incognito browser opened.")
 
                         # Reopen the service page URL
                         self.driver.get(url)
                         print(f"Reopened URL: {url}")
-                        time.sleep(25)  # Wait for popup to appear (20-30s)
 
                         # Fill popup form with increased wait and retry
                         popup_found = False
                         for attempt in range(1, 5):  # Try up to 4 times
                             try:
-                                WebDriverWait(self.driver, 30 + attempt * 15).until(
-                                    EC.visibility_of_element_located((By.CSS_SELECTOR, ".popup_wpr.popup_show"))
-                                )
+                                # Returns the moment the popup renders (it appears after 20-30s)
+                                popup_state = wait_for_popup(self.driver, 30 + attempt * 15)
+                                if popup_state == "not scheduled":
+                                    print("Page loaded without scheduling the popup, not retrying.")
+                                    break
+                                if popup_state != "shown":
+                                    raise TimeoutException(f"popup still {popup_state} after {30 + attempt * 15}s")
                                 print(f"Popup detected on attempt {attempt}. Filling popup form...")
                                 self.driver.find_element(*ElementLocators.POPUP_NAME_FIELD.value).send_keys("Test Automation")
                                 time.sleep(1)
@@ -282,14 +275,19 @@ class UnifiedAutomation(unittest.TestCase):
                                 print("Popup form submitted successfully.")
                                 time.sleep(5)
                                 popup_found = True
-                                self.passed_urls.append(f"✅ Popup Form Submitted - {url}")
+                                self.results.passed(
+                                    "Service Popup", url, country=country_name, duration=time.perf_counter() - started
+                                )
                                 break
                             except Exception as e:
                                 print(f"Attempt {attempt}: Popup not found or error filling popup: {e}")
                                 time.sleep(10)
                         if not popup_found:
                             print("Popup did not appear after maximum wait time.")
-                            self.failed_urls.append(f"❌ Popup Form Failed - {url}")
+                            self.results.failed(
+                                "Service Popup", url, country=country_name, duration=time.perf_counter() - started,
+                                error="popup did not appear",
+                            )
 
                         # Fill all required fields in service page form after popup
                         try:
@@ -306,10 +304,12 @@ class UnifiedAutomation(unittest.TestCase):
                                 "This is a Service Page form automation test project detail."
                             )
                             time.sleep(1)
-                            self.passed_urls.append(f"✅ Service Page Form Submitted - {url}")
+                            self.results.passed(page_type, url, country=country_name, duration=time.perf_counter() - started)
                         except Exception as e:
                             print(f"Error filling service page form after popup: {e}")
-                            self.failed_urls.append(f"❌ Service Page Form Failed - {url}")
+                            self.results.failed(
+                                page_type, url, country=country_name, duration=time.perf_counter() - started, error=e
+                            )
                         time.sleep(15)
 
                     elif page_type == "Hire Form":
@@ -326,18 +326,19 @@ class UnifiedAutomation(unittest.TestCase):
                     self.driver.find_element(*ElementLocators.SUBMIT_BUTTON.value).click()
                     time.sleep(10)
 
-                    self.passed_urls.append(f"✅ {country_name} - {page_type} - {url}")
+                    self.results.passed(page_type, url, country=country_name, duration=time.perf_counter() - started)
 
                 except Exception as e:
                     error_msg = traceback.format_exc().splitlines()[-1]
                     print(f"Error: {error_msg}")
-                    self.failed_urls.append(f"❌ {country_name} - {page_type} - {url}")
+                    self.results.failed(
+                        page_type, url, country=country_name, duration=time.perf_counter() - started, error=error_msg
+                    )
 
     @classmethod
     def tearDownClass(cls):
         """Cleanup driver and send report"""
-        with open(cls.counter_file, 'w') as f:
-            f.write(str(cls.email_counter))
+        cls.emails.release()
         cls.driver.quit()
         cls.send_email_report()
 
@@ -352,16 +353,17 @@ class UnifiedAutomation(unittest.TestCase):
         <h3>Test Report</h3>
         <p><b>Passed Tests:</b></p>
         <ul>
-            {''.join(f"<li>{test}</li>" for test in cls.passed_urls)}
+            {''.join(f"<li>{line}</li>" for line in cls.results.lines("passed"))}
         </ul>
 
         <p><b>Failed Tests:</b></p>
         <ul>
-            {''.join(f"<li>{test}</li>" for test in cls.failed_urls) if cls.failed_urls else "<li>No test failures 🎉</li>"}
+            {''.join(f"<li>{line}</li>" for line in cls.results.lines("failed")) or "<li>No test failures 🎉</li>"}
         </ul>
         """
 
-        smtp_send(
+        report_mailer.send(
+            smtp_send,
             sender_email=sender_email,
             receiver_email=receiver_email,
             cc_email=cc_email,
@@ -369,7 +371,7 @@ class UnifiedAutomation(unittest.TestCase):
             password=password,
             email_body=email_body
         )
-        print("Email Sent Successfully!")
+        print("Email report queued.")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,153 @@
+import argparse
+import hashlib
+import json
+import os
+import tempfile
+import time
+from selenium.common.exceptions import TimeoutException
+from form_filler import LOCATE_JS
+from misfinal import BLOCKING_OVERRIDES, PAGE_LOCATORS, PAGE_TYPES, URLS, ElementLocators, UnifiedAutomation, preflight_targets
+from navigation import open_form_page
+import network_capture
+import preflight
+import report_mailer
+from network_profile import apply_blocking_profile, profile_for
+
+STATE_FILE = os.getenv("MONITOR_STATE", "monitor_state.json")
+
+# Every locator's presence/visibility plus the controls of the form they live in, in one round trip
+STRUCTURE_JS = LOCATE_JS + """
+const result = {locators: {}, form: []};
+let form = null;
+for (const [name, by, selector] of arguments[0]) {
+    const element = find(by, selector);
+    if (!element) { result.locators[name] = 'missing'; continue; }
+    form = form || element.form || element.closest('form');
+    const visible = element.type === 'file' || element.getClientRects().length > 0;
+    result.locators[name] = !visible ? 'hidden' : element.disabled ? 'disabled' : 'ok';
+}
+if (form) {
+    result.form = Array.from(form.elements).map(element => [
+        element.tagName, element.type || '', element.name || '', element.id || '', element.required,
+        element.tagName === 'SELECT' ? element.options.length : 0,
+    ]);
+}
+return result;
+"""
+
+
+def check_structure(driver, url, page_type, ceiling=30):
+    """
+    Load url and check every locator of the page type without submitting. Returns
+    {"problems": [...], "fingerprint": sha1 of the form's controls}.
+    """
+    names = PAGE_LOCATORS[page_type]
+    apply_blocking_profile(driver, profile_for(url, BLOCKING_OVERRIDES))
+    try:
+        open_form_page(driver, url, ElementLocators, ElementLocators[names[0]], ElementLocators[names[-1]], ceiling)
+    except TimeoutException:
+        pass  # the locator report below says what is wrong
+    fields = [[name, *ElementLocators[name].value] for name in names]
+    result = driver.execute_script(STRUCTURE_JS, fields)
+    problems = [f"{name} {state}" for name, state in result["locators"].items() if state != "ok"]
+    fingerprint = hashlib.sha1(json.dumps(result["form"]).encode()).hexdigest()
+    # Nothing reads this page's network events, drop them so the capture backlog stays small
+    network_capture.read_events(driver)
+    return {"problems": problems, "fingerprint": fingerprint}
+
+
+def load_state(path=STATE_FILE):
+    try:
+        with open(path, 'r') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_state(state, path=STATE_FILE):
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)))
+    with os.fdopen(fd, 'w') as f:
+        json.dump(state, f, indent=2)
+    os.replace(tmp_path, path)
+
+
+def run_cycle(state, full_every):
+    """Structural check of every URL, full submission only where due or where the form changed"""
+    # One results file for the whole process, each report covers only the current cycle
+    results = UnifiedAutomation.results
+    results.cycle = (results.cycle or 0) + 1
+    # Fresh every cycle, setUpClass's snapshot would keep failing pages that have since been fixed
+    UnifiedAutomation.preflight_failures = preflight.run(preflight_targets())
+    now = time.time()
+    full_runs = 0
+    for key, url_list in URLS.items():
+        page_type = PAGE_TYPES[key]
+        for country_name, url in url_list:
+            entry = state.setdefault(url, {"fingerprint": None, "last_full": 0})
+            try:
+                check = check_structure(UnifiedAutomation.driver, url, page_type)
+            except Exception as e:
+                check = {"problems": [f"page did not load: {e}".splitlines()[0]], "fingerprint": None}
+            entry["last_check"] = now
+            entry["problems"] = check["problems"]
+
+            if check["problems"]:
+                print(f"❌ Structure {country_name} - {page_type}: {', '.join(check['problems'])}")
+                UnifiedAutomation.results.failed(
+                    page_type, url, country=country_name, error=f"structure: {', '.join(check['problems'])}"
+                )
+                continue
+
+            changed = entry["fingerprint"] is not None and check["fingerprint"] != entry["fingerprint"]
+            due = now - entry["last_full"] >= full_every
+            entry["fingerprint"] = check["fingerprint"]
+            if not (changed or due):
+                print(f"✅ Structure {country_name} - {page_type}")
+                continue
+
+            print(f"Full run for {country_name} - {page_type} ({'form changed' if changed else 'due'})")
+            UnifiedAutomation().run_tests([(country_name, url)], page_type)
+            entry["last_full"] = now
+            full_runs += 1
+    return full_runs
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Cheap structural checks every cycle, full submissions on a slower cadence")
+    parser.add_argument("--interval", type=float, default=300, help="seconds between structural cycles")
+    parser.add_argument("--full-every", type=float, default=6 * 3600, help="seconds between full submissions per URL")
+    parser.add_argument("--state", default=STATE_FILE)
+    parser.add_argument("--once", action="store_true", help="run a single cycle and exit")
+    args = parser.parse_args(argv)
+
+    state = load_state(args.state)
+    reported = None
+    UnifiedAutomation.setUpClass()
+    try:
+        while True:
+            started = time.monotonic()
+            full_runs = run_cycle(state, args.full_every)
+            save_state(state, args.state)
+
+            # Mail when something was submitted or the set of failures changed, not every cycle
+            failures = sorted(
+                (entry["country"], entry["page_type"], entry["url"]) for entry in UnifiedAutomation.results.records("failed")
+            )
+            if full_runs or failures != reported:
+                UnifiedAutomation.send_email_report()
+                # Mail now rather than at exit, the monitor runs until stopped
+                report_mailer.dispatch()
+                reported = failures
+            print(f"Cycle done in {time.monotonic() - started:.0f}s, {full_runs} full runs")
+
+            if args.once:
+                break
+            time.sleep(max(0.0, args.interval - (time.monotonic() - started)))
+    finally:
+        UnifiedAutomation.emails.release()
+        UnifiedAutomation.driver.quit()
+        UnifiedAutomation.artifacts.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+from selenium.webdriver.support.ui import WebDriverWait
+from step_engine import POLL_INTERVAL, element_interactable
+
+
+def use_eager_loading(options):
+    """driver.get() returns once the DOM is parsed instead of waiting for the load event"""
+    options.page_load_strategy = "eager"
+    return options
+
+
+def form_ready(first, submit):
+    """First form field and submit button are both interactive"""
+    first_ready = element_interactable(first)
+    submit_ready = element_interactable(submit)
+
+    def condition(driver):
+        return first_ready(driver) and submit_ready(driver)
+    return condition
+
+
+def open_form_page(driver, url, locators, first=None, submit=None, ceiling=30):
+    """
+    Navigate to url and return as soon as the target form can be filled, while images and
+    trackers may still be loading. Defaults to the Enum's first locator and its SUBMIT_BUTTON.
+    """
+    first = first or next(iter(locators))
+    submit = submit or locators.SUBMIT_BUTTON
+    driver.get(url)
+    WebDriverWait(driver, ceiling, poll_frequency=POLL_INTERVAL).until(
+        form_ready(first.value, submit.value), f"form not ready on {url}"
+    )
+
+
+# Runs before any page script and promotes the sites' deferred script[type=lazyJs] tags as soon as
+# the DOM is parsed, the same swap their loader does on the first scroll, mousemove or touch. Scripts
+# are promoted one at a time in document order, each external one only after the previous has
+# loaded or failed, so inline code never runs ahead of the library it calls.
+LAZY_ACTIVATION_JS = """
+(function () {
+  if (window.__lazyActivation) return;
+  var activation = window.__lazyActivation = {activated: 0};
+  var queue = [];
+  var seen = new WeakSet();
+  var running = false;
+  function promote(old) {
+    var script = document.createElement('script');
+    Array.prototype.forEach.call(old.attributes, function (attribute) {
+      if (attribute.name !== 'type') script.setAttribute(attribute.name, attribute.value);
+    });
+    if (!old.src && old.dataset.src) script.src = old.dataset.src;
+    if (!script.src) script.text = old.text;
+    old.replaceWith(script);
+    activation.activated++;
+    return script;
+  }
+  function next() {
+    while (queue.length) {
+      var old = queue.shift();
+      // The site's own loader may have swapped it in the meantime
+      if (!old.isConnected || old.getAttribute('type') !== 'lazyJs') continue;
+      var script = promote(old);
+      if (script.src) {
+        script.onload = script.onerror = next;
+        return;
+      }
+    }
+    running = false;
+  }
+  function activateAll() {
+    document.querySelectorAll('script[type="lazyJs"]').forEach(function (old) {
+      if (seen.has(old)) return;
+      seen.add(old);
+      queue.push(old);
+    });
+    if (!running && queue.length) {
+      running = true;
+      next();
+    }
+  }
+  document.addEventListener('DOMContentLoaded', function () {
+    activateAll();
+    new MutationObserver(activateAll).observe(document.documentElement, {childList: true, subtree: true});
+  });
+})();
+"""
+
+
+def activate_lazy_scripts(driver):
+    """Run lazyJs scripts on DOM ready for every document the current tab loads from now on"""
+    driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {"source": LAZY_ACTIVATION_JS})
@@ -0,0 +1,129 @@
+import json
+import weakref
+from fnmatch import fnmatch
+from urllib.parse import urlparse
+
+# Events kept per driver for events_since(), older ones are dropped once a page runs past it
+BACKLOG_LIMIT = 5000
+
+# Form handlers a submit may post to other than the form's own action, e.g. AJAX forms
+SUBMIT_ENDPOINTS = [
+    "*/wp-admin/admin-ajax.php*",
+    "*/__submit*",  # standin_server
+]
+
+# Body of a script with `element` bound to a submit button: the absolute action of its form, or
+# null when the form has no action attribute
+FORM_ACTION_JS = """
+const form = element.form || element.closest('form');
+const action = form && form.getAttribute('action');
+return action ? new URL(action, location.href).href : null;
+"""
+
+# Network events drained from the performance log, per driver, as {"offset", "events"}. offset
+# is the stream position of events[0], so marks stay valid when older events are dropped.
+_backlog = weakref.WeakKeyDictionary()
+
+
+class SubmissionRejected(Exception):
+    """The server answered a form submission with an error status or the request failed"""
+
+    def __init__(self, message, status=None):
+        super().__init__(message)
+        # HTTP status of the answer, None when the request never got one
+        self.status = status
+
+
+def enable(options):
+    """Turn on Chrome's performance log so DevTools network events can be read back"""
+    options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+    return options
+
+
+def _drain(driver):
+    backlog = _backlog.setdefault(driver, {"offset": 0, "events": []})
+    events = backlog["events"]
+    for entry in driver.get_log("performance"):
+        log = json.loads(entry["message"])
+        message = log["message"]
+        if message["method"].startswith("Network."):
+            # webview is the target id of the tab the event came from, the same as its window handle
+            events.append((message["method"], message["params"], log.get("webview")))
+    if len(events) > BACKLOG_LIMIT:
+        dropped = len(events) - BACKLOG_LIMIT
+        del events[:dropped]
+        backlog["offset"] += dropped
+    return backlog
+
+
+def read_events(driver, prefix="Network."):
+    """Drain the performance log and return (method, params) for matching DevTools events"""
+    backlog = _drain(driver)
+    events, backlog["events"] = backlog["events"], []
+    backlog["offset"] += len(events)
+    return [(method, params) for method, params, _ in events if method.startswith(prefix)]
+
+
+def mark(driver):
+    """Position in the event stream, pass to events_since() to see only later events"""
+    backlog = _drain(driver)
+    return backlog["offset"] + len(backlog["events"])
+
+
+def events_since(driver, since, prefix="Network.", webview=None):
+    """Events after mark `since`, optionally of one tab only, without consuming them for read_events()"""
+    backlog = _drain(driver)
+    return [
+        (method, params) for method, params, source in backlog["events"][max(0, since - backlog["offset"]):]
+        if method.startswith(prefix) and (webview is None or source is None or webview.endswith(source))
+    ]
+
+
+def site_of(url):
+    """Last two labels of the host, so www. and subdomains count as the same site"""
+    host = urlparse(url).hostname or ""
+    return ".".join(host.split(".")[-2:])
+
+
+def _without_query(url):
+    return url.split("#")[0].split("?")[0]
+
+
+def is_submission(url, site, action=None):
+    """url goes to the form's action, or to one of the site's SUBMIT_ENDPOINTS"""
+    if action and _without_query(url) == _without_query(action):
+        return True
+    return site_of(url) == site and any(fnmatch(url, pattern) for pattern in SUBMIT_ENDPOINTS)
+
+
+def form_response(driver, since, site, methods=("POST",), webview=None, action=None):
+    """
+    Response to the first submission request (see is_submission()) with one of methods sent after
+    mark `since` (by the tab with handle webview, if given) as {"url", "method", "status",
+    "latency"}, or None while it is still in flight. Other requests, e.g. analytics beacons, are
+    ignored. Raises SubmissionRejected on a 4xx/5xx status or a failed load.
+    """
+    return match_form_response(events_since(driver, since, webview=webview), site, methods, action)
+
+
+def match_form_response(events, site, methods=("POST",), action=None):
+    """form_response() over (method, params) events that were collected some other way"""
+    requests = {}
+    for method, params in events:
+        request_id = params.get("requestId")
+        if method == "Network.requestWillBeSent":
+            request = params["request"]
+            if request_id not in requests and request["method"] in methods and is_submission(request["url"], site, action):
+                requests[request_id] = (request["method"], request["url"], params["timestamp"])
+        elif request_id not in requests:
+            continue
+        elif method == "Network.responseReceived":
+            request_method, url, sent = requests[request_id]
+            status = params["response"]["status"]
+            if status >= 400:
+                raise SubmissionRejected(f"{request_method} {url} returned {status}", status)
+            return {"url": url, "method": request_method, "status": status, "latency": params["timestamp"] - sent}
+        elif method == "Network.loadingFailed" and params.get("blockedReason") != "inspector":
+            request_method, url, _ = requests[request_id]
+            raise SubmissionRejected(f"{request_method} {url} failed: {params.get('errorText')}")
+    return None
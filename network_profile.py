@@ -0,0 +1,104 @@
+from collections import Counter
+from fnmatch import fnmatch
+from urllib.parse import urlparse
+import network_capture
+
+# Analytics tags, chat widgets, video embeds and fonts, none of which the lead forms need
+COMMON_BLOCK = [
+    "*google-analytics.com*",
+    "*googletagmanager.com*",
+    "*doubleclick.net*",
+    "*googleadservices.com*",
+    "*connect.facebook.net*",
+    "*facebook.com/tr*",
+    "*hotjar.com*",
+    "*clarity.ms*",
+    "*snap.licdn.com*",
+    "*px.ads.linkedin.com*",
+    "*bat.bing.com*",
+    "*embed.tawk.to*",
+    "*zopim.com*",
+    "*zdassets.com*",
+    "*widget.intercom.io*",
+    "*youtube.com/embed*",
+    "*ytimg.com*",
+    "*player.vimeo.com*",
+    "*fonts.googleapis.com*",
+    "*fonts.gstatic.com*",
+    "*.woff*",
+    "*.ttf*",
+]
+
+# Form validation has to keep working
+COMMON_ALLOW = [
+    "*google.com/recaptcha*",
+    "*gstatic.com/recaptcha*",
+    "*recaptcha.net*",
+]
+
+SITE_PROFILES = {
+    "magnetoitsolutions.com": {"block": COMMON_BLOCK, "allow": COMMON_ALLOW},
+    "bytestechnolab.com": {"block": COMMON_BLOCK, "allow": COMMON_ALLOW},
+    "nexstaralliance.com": {"block": COMMON_BLOCK, "allow": COMMON_ALLOW},
+}
+
+# Loads the page with nothing blocked
+NO_BLOCKING = {"block": [], "allow": []}
+
+
+def profile_for(url, overrides=None):
+    """Per URL override first, then the profile of the URL's site"""
+    if overrides and url in overrides:
+        return overrides[url]
+    host = urlparse(url).hostname or ""
+    if host.startswith("www."):
+        host = host[4:]
+    return SITE_PROFILES.get(host, NO_BLOCKING)
+
+
+def blocked_patterns(profile):
+    """
+    Deny patterns minus any that would also catch an allowlisted URL. Network.setBlockedURLs has
+    no exceptions, so an allow entry can only drop whole block patterns: each allow pattern is
+    matched as if it were a URL ("*google.com/recaptcha*" against "*google.com*" drops the
+    latter). That holds for the host/path style patterns used here, a block pattern that is more
+    specific than the allow entry it overlaps with is kept.
+    """
+    return [
+        pattern for pattern in profile["block"]
+        if not any(fnmatch(allowed, pattern) for allowed in profile["allow"])
+    ]
+
+
+def apply_blocking_profile(driver, profile):
+    """Block the profile's URL patterns for the current tab, call before navigating"""
+    patterns = blocked_patterns(profile)
+    driver.execute_cdp_cmd("Network.enable", {})
+    driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": patterns})
+    return patterns
+
+
+def blocked_requests(driver):
+    """URLs blocked since the last call, needs network_capture.enable() on the driver options"""
+    urls = {}
+    blocked = []
+    for method, params in network_capture.read_events(driver):
+        if method == "Network.requestWillBeSent":
+            urls[params["requestId"]] = params["request"]["url"]
+        elif method == "Network.loadingFailed" and params.get("blockedReason") == "inspector":
+            blocked.append(urls.get(params["requestId"], params["requestId"]))
+    return blocked
+
+
+def print_blocked_report(url, blocked):
+    hosts = Counter(urlparse(blocked_url).hostname for blocked_url in blocked)
+    summary = ", ".join(f"{host} x{count}" for host, count in hosts.most_common())
+    print(f"Blocked {len(blocked)} requests on {url}" + (f": {summary}" if summary else ""))
+
+
+def report_blocked(driver, url):
+    """Print what the blocking profile kept off the page, never failing the test over it"""
+    try:
+        print_blocked_report(url, blocked_requests(driver))
+    except Exception as e:
+        print(f"Could not read blocked requests: {e}")
@@ -1,46 +1,62 @@
 import unittest
 import os
 import traceback
+import time
 from selenium import webdriver
 from selenium.webdriver.chrome.service import Service
-from webdriver_manager.chrome import ChromeDriverManager
+from driver_cache import chromedriver_path
+from email_counter import EmailCounter
+import preflight
+from results_store import ResultsStore
+from network_profile import apply_blocking_profile, profile_for, report_blocked
+import network_capture
+from step_engine import Steps
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from Env_sender import smtp_send
+import report_mailer
+
+STARTING_URL = "https://www.nexstaralliance.com/"
+
+# Contact form markup the HTTP preflight looks for in the raw HTML
+FORM_MARKERS = {"ids": ["nexstar_contact", "name", "email", "tel", "select", "message"], "names": []}
 
 class Bytes(unittest.TestCase):
 
     counter_file = "email_counter.txt"
-    passed_urls = []
-    failed_urls = []
 
     @classmethod
     def setUpClass(cls):
+        # The page is failed without a browser session if it cannot pass
+        cls.preflight_failures = preflight.run({STARTING_URL: FORM_MARKERS})
+
         options = webdriver.ChromeOptions()
         options.add_argument("--headless")
         options.add_argument("--window-size=1920,1080")
         options.add_argument("--disable-gpu")
         options.add_argument("--no-sandbox")
         options.add_argument("--disable-dev-shm-usage")
-        cls.driver = webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=options)
+        network_capture.enable(options)
+        cls.driver = webdriver.Chrome(service=Service(chromedriver_path()), options=options)
         cls.driver.set_window_size(1920, 1080)
 
-        if os.path.exists(Bytes.counter_file):
-            with open(Bytes.counter_file, 'r') as f:
-                Bytes.email_counter = int(f.read().strip())
-        else:
-            Bytes.email_counter = 1
+        # Address numbers come from the shared counter file in locked blocks
+        Bytes.emails = EmailCounter(Bytes.counter_file)
+
+        cls.results = ResultsStore("nextstar")
 
     def generate_custom_email(self, base_name='ilfas.mansuri', domain='bytestechnolab.com'):
-        custom_email = f"{base_name}+{Bytes.email_counter}@{domain}"
-        Bytes.email_counter += 1
+        custom_email = f"{base_name}+{Bytes.emails.next()}@{domain}"
         return custom_email
 
     def test_bytes_contact_us_form(self):
-        starting_url = "https://www.nexstaralliance.com/"
+        starting_url = STARTING_URL
         test_name = "Nexstar Contact Us"
+        started = time.perf_counter()
         try:
+            preflight.ensure(self.preflight_failures, starting_url)
+            apply_blocking_profile(self.driver, profile_for(starting_url))
             self.driver.get(starting_url)
             self.driver.execute_script("window.scrollBy(0, 4000);")
             self.driver.save_screenshot("headless_debug.png")  # Debug screenshot
@@ -78,22 +94,22 @@ class Bytes(unittest.TestCase):
             )
             message_elem.send_keys("This is testing team of Bytes Technolab")
 
-            # Wait for the submit button and click
-            button = WebDriverWait(self.driver, 20).until(
-                EC.element_to_be_clickable((By.XPATH, '//*[@id="nexstar_contact"]/input'))
+            # Click submit and wait for the server to accept the lead
+            response = Steps(self.driver, ceiling=20).submit_confirmed(
+                (By.XPATH, '//*[@id="nexstar_contact"]/input'), js=True
             )
-            self.driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", button)
-            self.driver.execute_script("arguments[0].click();", button)
+            print(f"Submission answered {response['status']} in {response['latency']:.2f}s")
 
-            self.passed_urls.append(f"✅ {test_name} - {starting_url}")
+            self.results.passed(test_name, starting_url, duration=time.perf_counter() - started)
         except Exception as e:
             print(f"Error during test: {traceback.format_exc()}")
-            self.failed_urls.append(f"❌ {test_name} - {starting_url}")
+            self.results.failed(test_name, starting_url, duration=time.perf_counter() - started, error=e)
+        finally:
+            report_blocked(self.driver, starting_url)
 
     @classmethod
     def tearDownClass(cls):
-        with open(Bytes.counter_file, 'w') as f:
-            f.write(str(Bytes.email_counter))
+        Bytes.emails.release()
         cls.driver.quit()
         cls.send_email_report()
 
@@ -109,15 +125,16 @@ class Bytes(unittest.TestCase):
         <h3>Test Report</h3>
         <p><b>Passed Tests:</b></p>
         <ul>
-            {''.join(f"<li>{test}</li>" for test in cls.passed_urls)}
+            {''.join(f"<li>{line}</li>" for line in cls.results.lines("passed"))}
         </ul>
         <p><b>Failed Tests:</b></p>
         <ul>
-            {''.join(f"<li>{test}</li>" for test in cls.failed_urls) if cls.failed_urls else "<li>No test failures</li>"}
+            {''.join(f"<li>{line}</li>" for line in cls.results.lines("failed")) or "<li>No test failures</li>"}
         </ul>
         """
 
-        smtp_send(
+        report_mailer.send(
+            smtp_send,
             sender_email=sender_email,
             receiver_email=receiver_email,
             cc_email=cc_email,
@@ -125,7 +142,7 @@ class Bytes(unittest.TestCase):
             password=password,
             email_body=email_body
         )
-        print("Email Sent Successfully!")
+        print("Email report queued.")
 
 if __name__ == "__main__":
     unittest.main()
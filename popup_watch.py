@@ -0,0 +1,121 @@
+from selenium.common.exceptions import TimeoutException, WebDriverException
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+from step_engine import POLL_INTERVAL, element_interactable
+
+POPUP_SELECTOR = ".popup_wpr.popup_show"
+POPUP_CLOSE = (By.CSS_SELECTOR, "button.close_img_btn")
+
+# Runs before any page script. Watches the DOM for the popup and tracks the page's long timers,
+# so once the page has loaded, has no lazyJs left and no long timer pending, a popup that has not
+# shown is definitely not coming: state goes "pending" -> "shown" or "not scheduled". A watcher
+# installed after the page loaded cannot see timers scheduled before it, so it starts "unknown"
+# and only ever moves to "shown".
+WATCHER_TEMPLATE = """
+(function () {
+  if (window.__popupWatch) return;
+  var watch = window.__popupWatch = {state: '%(initial)s', shown_ms: null, timers: 0};
+  var SHOWN = '%(shown)s';
+  function visible(element) {
+    return element && element.getClientRects().length > 0 && getComputedStyle(element).visibility !== 'hidden';
+  }
+  function check() {
+    if (watch.state === 'shown') return;
+    if (visible(document.querySelector(SHOWN))) {
+      watch.state = 'shown';
+      watch.shown_ms = Math.round(performance.now());
+      return;
+    }
+    if (watch.state === 'unknown' || document.readyState !== 'complete' || watch.timers > 0) return;
+    if (document.querySelector('script[type="lazyJs"]')) return;
+    watch.state = 'not scheduled';
+  }
+  var originalSetTimeout = window.setTimeout;
+  var originalClearTimeout = window.clearTimeout;
+  var longTimers = new Set();
+  window.setTimeout = function (callback, delay) {
+    if (typeof callback !== 'function' || !(delay >= 1000)) {
+      return originalSetTimeout.apply(window, arguments);
+    }
+    var args = Array.prototype.slice.call(arguments, 2);
+    var id = originalSetTimeout.call(window, function () {
+      try {
+        callback.apply(window, args);
+      } finally {
+        if (longTimers.delete(id)) watch.timers--;
+        originalSetTimeout.call(window, check, 0);
+      }
+    }, delay);
+    longTimers.add(id);
+    watch.timers++;
+    return id;
+  };
+  window.clearTimeout = function (id) {
+    if (longTimers.delete(id)) {
+      watch.timers--;
+      originalSetTimeout.call(window, check, 0);
+    }
+    return originalClearTimeout.apply(window, arguments);
+  };
+  new MutationObserver(check).observe(document, {
+    attributes: true, attributeFilter: ['class', 'style'], childList: true, subtree: true
+  });
+  window.addEventListener('load', function () { originalSetTimeout.call(window, check, 0); });
+})();
+"""
+
+WATCHER_JS = WATCHER_TEMPLATE % {"shown": POPUP_SELECTOR, "initial": "pending"}
+
+READ_STATE_JS = WATCHER_TEMPLATE % {"shown": POPUP_SELECTOR, "initial": "unknown"} + """
+var watch = window.__popupWatch;
+return {state: watch.state, shown_ms: watch.shown_ms, timers: watch.timers};
+"""
+
+
+def watch_popups(driver):
+    """Install the watcher on every document the current tab loads from now on, call before navigating"""
+    driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {"source": WATCHER_JS})
+
+
+def popup_state(driver):
+    """{"state", "shown_ms", "timers"}, installs the watcher late if the page was loaded without it"""
+    return driver.execute_script(READ_STATE_JS)
+
+
+def wait_for_popup(driver, timeout=15):
+    """
+    "shown" the moment the popup renders, "not scheduled" once it cannot appear. On timeout the
+    last state seen, "pending", or "unknown" when the watcher was installed too late to tell.
+    """
+    last = {"state": "pending"}
+
+    def settled(driver):
+        try:
+            last.update(popup_state(driver))
+        except WebDriverException:
+            return False
+        return last["state"] if last["state"] not in ("pending", "unknown") else False
+
+    try:
+        return WebDriverWait(driver, timeout, poll_frequency=POLL_INTERVAL).until(settled)
+    except TimeoutException:
+        return last["state"]
+
+
+def close_popup_if_present(driver, timeout=15):
+    """Wait for the popup to settle and close it if it showed"""
+    state = wait_for_popup(driver, timeout)
+    if state != "shown":
+        print(f"No popup found ({state}).")
+        return False
+    print("Popup appeared.")
+    try:
+        close_btn = WebDriverWait(driver, timeout, poll_frequency=POLL_INTERVAL).until(
+            element_interactable(POPUP_CLOSE), "popup close button not clickable"
+        )
+        close_btn.click()
+    except WebDriverException as e:
+        print(f"Could not close popup: {e}")
+        return False
+    print("Popup closed successfully.")
+    return True
@@ -0,0 +1,125 @@
+import os
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+import requests
+from requests.adapters import HTTPAdapter
+from selenium.webdriver.common.by import By
+
+# PREFLIGHT=0 sends every URL straight to the browser
+ENABLED = os.getenv("PREFLIGHT", "1") != "0"
+
+# Fields every MIS page type has, checked on the pages of the suites without per-type locators
+MIS_LOCATORS = ["NAME_FIELD", "EMAIL_FIELD", "PHONE_FIELD", "SUBMIT_BUTTON"]
+
+TIMEOUT = 10
+WORKERS = 16
+
+# Some of the sites answer the default python-requests agent with a 403
+USER_AGENT = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+    "(KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+)
+
+# //*[@id="btn-validate"] style XPaths still name a plain id
+XPATH_ID = re.compile(r"""^//\*\[@id=["']([^"']+)["']\]""")
+
+
+class PreflightFailed(Exception):
+    """The page failed its HTTP preflight, the browser session is skipped"""
+
+
+def markers(locators, names=None):
+    """{"ids": [...], "names": [...]} the raw HTML must contain for these locators"""
+    found = {"ids": [], "names": []}
+    for member in (locators[name] for name in names) if names else locators:
+        by, selector = member.value
+        if by == By.ID:
+            found["ids"].append(selector)
+        elif by == By.NAME:
+            found["names"].append(selector)
+        elif by == By.XPATH and XPATH_ID.match(selector):
+            found["ids"].append(XPATH_ID.match(selector).group(1))
+    return found
+
+
+def _has_attribute(html, attribute, value):
+    return re.search(rf"""(?<![\w-]){attribute}\s*=\s*["']?{re.escape(value)}(?=["'\s>/])""", html) is not None
+
+
+def _page_key(url):
+    parsed = urlparse(url)
+    host = parsed.hostname or ""
+    return (host[4:] if host.startswith("www.") else host), parsed.path.rstrip("/")
+
+
+def http_session(workers=WORKERS):
+    """requests session pooling keep-alive connections for `workers` threads, with a browser user agent"""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=8, pool_maxsize=workers, max_retries=1)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.headers["User-Agent"] = USER_AGENT
+    return session
+
+
+def check_url(session, url, expected=None):
+    """None if the page can pass in a browser, else why not"""
+    try:
+        response = session.get(url, timeout=TIMEOUT, allow_redirects=True)
+    except requests.RequestException as e:
+        return f"{type(e).__name__}: {e}".splitlines()[0]
+    if response.status_code >= 400:
+        return f"HTTP {response.status_code}"
+    # http->https, www and trailing slash redirects are fine, landing on another page is not
+    if _page_key(response.url) != _page_key(url):
+        return f"redirected to {response.url}"
+    expected = expected or {}
+    missing = [f"#{value}" for value in expected.get("ids", []) if not _has_attribute(response.text, "id", value)]
+    missing += [f"[name={value}]" for value in expected.get("names", []) if not _has_attribute(response.text, "name", value)]
+    if missing:
+        return f"form markup missing {', '.join(missing)}"
+    return None
+
+
+def run(targets, workers=WORKERS):
+    """
+    Check {url: markers} concurrently over one pooled HTTP client, returns {url: reason} for the
+    pages that cannot pass. Empty when PREFLIGHT=0.
+    """
+    if not ENABLED or not targets:
+        return {}
+    started = time.perf_counter()
+    session = http_session(workers)
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        reasons = dict(zip(targets, pool.map(lambda url: check_url(session, url, targets[url]), targets)))
+    failures = {url: reason for url, reason in reasons.items() if reason}
+    print(f"Preflight: {len(targets)} URLs in {time.perf_counter() - started:.1f}s, {len(failures)} failing")
+    for url, reason in failures.items():
+        print(f"  ❌ {url}: {reason}")
+    return failures
+
+
+def ensure(failures, url):
+    """Fail the browser test for url straight away if its preflight failed"""
+    if url in failures:
+        raise PreflightFailed(f"preflight: {failures[url]}")
+
+
+if __name__ == "__main__":
+    import bytes as bytes_suite
+    import mis
+    import misfinal
+    import misnew
+    import mispopup
+    import nextstar
+
+    all_targets = misfinal.preflight_targets()
+    for suite in (mis, misnew, mispopup):
+        for url_list in suite.URLS.values():
+            for _, url in url_list:
+                all_targets.setdefault(url, markers(suite.ElementLocators, MIS_LOCATORS))
+    all_targets.update({url: markers(locators) for _, url, locators in bytes_suite.URLS})
+    all_targets[nextstar.STARTING_URL] = nextstar.FORM_MARKERS
+    raise SystemExit(1 if run(all_targets) else 0)
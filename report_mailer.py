@@ -0,0 +1,166 @@
+import atexit
+import html
+import os
+import smtplib
+import tempfile
+import threading
+import time
+from email.mime.text import MIMEText
+from retry_policy import RetryPolicy
+
+# Longest the process waits at exit for the digest to be delivered, a hung server never stalls it longer
+DELIVERY_TIMEOUT = float(os.getenv("REPORT_TIMEOUT", "60"))
+
+ATTEMPTS = 4
+BACKOFF = 2.0
+
+# Digests that could not be delivered in time are written here instead of being lost
+UNDELIVERED_DIR = os.getenv("REPORT_UNDELIVERED_DIR", "undelivered_reports")
+
+# SMTP_HOST=127.0.0.1:8025 sends every report to that server instead, e.g. standin_server --smtp-port 8025
+SMTP_HOST = os.getenv("SMTP_HOST")
+
+
+def plain_smtp(host, timeout=30):
+    """Transport with smtp_send's signature that talks unauthenticated SMTP to host:port"""
+    address, _, port = host.partition(":")
+
+    def send(sender_email, receiver_email, cc_email, subject, password, email_body):
+        message = MIMEText(email_body, "html", "utf-8")
+        message["Subject"] = subject
+        message["From"] = sender_email or "automation@localhost"
+        message["To"] = receiver_email or "reports@localhost"
+        if cc_email:
+            message["Cc"] = cc_email
+        recipients = [message["To"]] + ([cc_email] if cc_email else [])
+        with smtplib.SMTP(address, int(port or 25), timeout=timeout) as server:
+            server.sendmail(message["From"], recipients, message.as_string())
+
+    return send
+
+
+def digest(reports):
+    """One (subject, body) for every report of the batch, a single report is sent unchanged"""
+    if len(reports) == 1:
+        return reports[0]["subject"], reports[0]["email_body"]
+    subject = f"Automation Digest - {len(reports)} reports"
+    sections = [f"<h2>{report['subject']}</h2>{report['email_body']}" for report in reports]
+    return subject, "<hr>".join(sections)
+
+
+def save_undelivered(subject, email_body, directory=UNDELIVERED_DIR):
+    """Write a digest that was given up on to an HTML file and return its path"""
+    os.makedirs(directory, exist_ok=True)
+    fd, path = tempfile.mkstemp(prefix=f"{time.strftime('%Y%m%d-%H%M%S')}-", suffix=".html", dir=directory)
+    with os.fdopen(fd, 'w', encoding='utf-8') as f:
+        f.write(f"<html><head><title>{html.escape(subject)}</title></head><body>{email_body}</body></html>")
+    print(f"📁 Undelivered report saved to {path}")
+    return path
+
+
+class ReportMailer:
+    """
+    Delivers suite reports from a background thread so tearDownClass never waits on SMTP. Reports
+    are held until dispatch(), which happens at process exit at the latest, so every suite of a
+    run lands in one digest. Attempts and backoffs together stay within timeout seconds (an
+    SMTP_HOST connection gets only what is left of it), the wait at exit is bounded the same way,
+    and a digest given up on is saved to UNDELIVERED_DIR.
+    """
+
+    def __init__(self, attempts=ATTEMPTS, backoff=BACKOFF, timeout=DELIVERY_TIMEOUT):
+        self.attempts = attempts
+        self.backoff = backoff
+        self.timeout = timeout
+        self.pending = []
+        # (subject, email_body) of the digest being delivered right now
+        self.delivering = None
+        self.lock = threading.Lock()
+        self.wake = threading.Event()
+        self.idle = threading.Event()
+        self.idle.set()
+        self.thread = threading.Thread(target=self._work, name="report-mailer", daemon=True)
+        self.thread.start()
+
+    def send(self, transport, **report):
+        """Queue a report, report holds smtp_send's keyword arguments"""
+        with self.lock:
+            self.pending.append((transport, report))
+            self.idle.clear()
+
+    def dispatch(self):
+        """Start delivering everything queued so far as one digest, without waiting for it"""
+        self.wake.set()
+
+    def _work(self):
+        while True:
+            self.wake.wait()
+            self.wake.clear()
+            with self.lock:
+                batch, self.pending = self.pending, []
+            if batch:
+                self._deliver(batch)
+            with self.lock:
+                if not self.pending:
+                    self.idle.set()
+
+    def _deliver(self, batch):
+        transport, first = batch[0]
+        subject, email_body = digest([report for _, report in batch])
+        self.delivering = (subject, email_body)
+        retry = RetryPolicy(attempts=self.attempts, budget=self.timeout, base=self.backoff)
+        attempt = 0
+        for attempt in retry:
+            if SMTP_HOST:
+                transport = plain_smtp(SMTP_HOST, timeout=retry.remaining())
+            try:
+                transport(**dict(first, subject=subject, email_body=email_body))
+                print(f"📧 Report sent: {subject}")
+                self.delivering = None
+                return True
+            except Exception as e:
+                print(f"Report delivery attempt {attempt} failed: {e}")
+                if attempt < self.attempts:
+                    retry.backoff(attempt)
+        print(f"❌ Report not delivered after {attempt} attempts: {subject}")
+        save_undelivered(subject, email_body)
+        self.delivering = None
+        return False
+
+    def flush(self, timeout=None):
+        """Dispatch and wait up to timeout seconds for the reports to be sent or saved, True when they were"""
+        timeout = self.timeout if timeout is None else timeout
+        self.dispatch()
+        delivered = self.idle.wait(timeout)
+        if not delivered:
+            print(f"Report delivery still pending after {timeout:.0f}s, giving up on it")
+            with self.lock:
+                abandoned, self.pending = self.pending, []
+            if self.delivering:
+                save_undelivered(*self.delivering)
+            if abandoned:
+                save_undelivered(*digest([report for _, report in abandoned]))
+        return delivered
+
+
+_mailer = None
+_lock = threading.Lock()
+
+
+def mailer():
+    """The process-wide mailer, flushed when the process exits"""
+    global _mailer
+    with _lock:
+        if _mailer is None:
+            _mailer = ReportMailer()
+            atexit.register(_mailer.flush)
+    return _mailer
+
+
+def send(transport, **report):
+    """Queue a report for this run's digest"""
+    mailer().send(transport, **report)
+
+
+def dispatch():
+    """Send the reports queued so far now instead of at exit, e.g. once per monitor cycle"""
+    mailer().dispatch()
@@ -0,0 +1,92 @@
+import json
+import os
+import sys
+import time
+from file_lock import locked
+
+RESULTS_DIR = os.getenv("RESULTS_DIR", "results")
+
+STATUS_ICONS = {"passed": "✅", "failed": "❌"}
+
+
+class ResultsStore:
+    """
+    Append-only JSONL file with one record per page outcome, written the moment it is known.
+    Every write is a single locked append, so parallel workers and suites can share one file by
+    setting RESULTS_FILE. Reports stream the file back instead of keeping lists in memory.
+    Setting cycle tags every later record with it and limits reads to that cycle, so a
+    long-running process keeps one file.
+    """
+
+    def __init__(self, suite, path=None):
+        self.suite = suite
+        self.cycle = None
+        default = os.path.join(RESULTS_DIR, f"{suite}-{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}.jsonl")
+        self.path = path or os.getenv("RESULTS_FILE") or default
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+
+    def record(self, page_type, url, status, country=None, duration=None, error=None, artifacts=None):
+        if isinstance(error, BaseException):
+            error = f"{type(error).__name__}: {error}"
+        entry = {
+            "suite": self.suite,
+            "page_type": page_type,
+            "country": country,
+            "url": url,
+            "status": status,
+            "duration": round(duration, 3) if duration is not None else None,
+            "error": f"{error}".splitlines()[0] if error else None,
+            "artifacts": artifacts or {},
+            "time": time.time(),
+        }
+        if self.cycle is not None:
+            entry["cycle"] = self.cycle
+        with locked(self.path):
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        return entry
+
+    def passed(self, page_type, url, **details):
+        return self.record(page_type, url, "passed", **details)
+
+    def failed(self, page_type, url, **details):
+        return self.record(page_type, url, "failed", **details)
+
+    def records(self, status=None, all_suites=False):
+        """Stream this suite's records (every suite's with all_suites) back from the file"""
+        try:
+            f = open(self.path, 'r', encoding='utf-8')
+        except FileNotFoundError:
+            return
+        with f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue  # a writer killed mid-line
+                if self.cycle is not None and entry.get("cycle") != self.cycle:
+                    continue
+                if (all_suites or entry["suite"] == self.suite) and status in (None, entry["status"]):
+                    yield entry
+
+    def count(self, status=None):
+        return sum(1 for _ in self.records(status))
+
+    def lines(self, status):
+        """Report lines for one status, e.g. "❌ Canada - Contact Us - https://... - TimeoutException" """
+        for entry in self.records(status):
+            yield format_record(entry)
+
+
+def format_record(entry):
+    parts = [part for part in (entry["country"], entry["page_type"], entry["url"]) if part]
+    if entry["status"] == "failed" and entry["error"]:
+        parts.append(entry["error"])
+    return f"{STATUS_ICONS.get(entry['status'], '')} {' - '.join(parts)}"
+
+
+if __name__ == "__main__":
+    # python results_store.py results/<run>.jsonl shows a running or finished run's outcomes so far
+    store = ResultsStore(None, sys.argv[1])
+    for entry in store.records(all_suites=True):
+        print(f"[{entry['suite']}] {format_record(entry)}")
@@ -0,0 +1,112 @@
+import os
+import random
+import time
+from selenium.common.exceptions import WebDriverException
+from network_capture import SubmissionRejected, site_of
+
+# Consecutive outage-like failures on one site before its remaining URLs are skipped
+BREAKER_THRESHOLD = int(os.getenv("BREAKER_THRESHOLD", "3"))
+# Seconds an open breaker waits before letting one URL through to probe the site again
+BREAKER_COOLDOWN = float(os.getenv("BREAKER_COOLDOWN", "300"))
+
+
+class CircuitOpen(Exception):
+    """The site failed too often in a row, the page is failed without loading it"""
+
+
+class RetryPolicy:
+    """
+    Attempts bounded by a count and by a deadline shared across them. Iterating yields attempt
+    numbers until either runs out, timeout() clamps a wait to what is left of the budget and
+    backoff() sleeps a jittered, exponentially growing delay that never passes the deadline.
+    """
+
+    def __init__(self, attempts=4, budget=120.0, base=2.0, cap=15.0):
+        self.attempts = attempts
+        self.budget = budget
+        self.base = base
+        self.cap = cap
+        self.deadline = None
+
+    def remaining(self):
+        return max(0.0, self.deadline - time.monotonic())
+
+    def __iter__(self):
+        self.deadline = time.monotonic() + self.budget
+        for attempt in range(1, self.attempts + 1):
+            if self.remaining() <= 0:
+                return
+            yield attempt
+
+    def timeout(self, seconds):
+        """seconds, or less when the budget ends sooner"""
+        return min(seconds, self.remaining())
+
+    def backoff(self, attempt):
+        # Full jitter, so pages retrying at the same time do not hit the site in lockstep
+        delay = random.uniform(0, min(self.cap, self.base * 2 ** (attempt - 1)))
+        time.sleep(min(delay, self.remaining()))
+
+
+# Chrome's page load timeout, the server never answered the navigation
+PAGE_LOAD_TIMEOUT = "Timed out receiving message from renderer"
+
+
+def is_outage(error):
+    """
+    Failures that say the site is down or unreachable rather than that one form is broken: a
+    navigation or request that got no response or a 5xx. Waits for an element or a popup that
+    time out say nothing about the site and never count.
+    """
+    if isinstance(error, SubmissionRejected):
+        return error.status is None or error.status >= 500
+    message = str(error)
+    return isinstance(error, WebDriverException) and ("net::ERR_" in message or PAGE_LOAD_TIMEOUT in message)
+
+
+class CircuitBreaker:
+    """
+    Per-site breaker: after `threshold` outage-like failures in a row on one site, check() fails
+    that site's remaining URLs at once. After `cooldown` seconds exactly one URL is let through
+    while the others keep failing, its success closes the breaker again and its failure keeps it
+    open for another cooldown.
+    """
+
+    def __init__(self, threshold=BREAKER_THRESHOLD, cooldown=BREAKER_COOLDOWN):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.failures = {}
+        self.opened = {}
+        # site -> when its probe URL was let through, until record() hears how it went
+        self.probing = {}
+
+    def check(self, url):
+        site = site_of(url)
+        opened = self.opened.get(site)
+        if opened is None:
+            return
+        now = time.monotonic()
+        probe = self.probing.get(site)
+        # A probe that never reported back (e.g. an uncaught error) frees the slot after a cooldown
+        if probe is not None and now - probe < self.cooldown:
+            raise CircuitOpen(f"{site} skipped while another URL probes it")
+        if now - opened < self.cooldown:
+            raise CircuitOpen(f"{site} skipped after {self.failures[site]} failures in a row")
+        # Half open, this URL probes the site, a failure reopens the breaker right away
+        self.probing[site] = now
+        self.failures[site] = self.threshold - 1
+
+    def record(self, url, error=None):
+        """Count a page's outcome, error is the exception it failed with or None when it passed"""
+        site = site_of(url)
+        if error is None or not is_outage(error):
+            self.failures[site] = 0
+            self.opened.pop(site, None)
+            self.probing.pop(site, None)
+            return
+        self.probing.pop(site, None)
+        self.failures[site] = self.failures.get(site, 0) + 1
+        if self.failures[site] >= self.threshold:
+            if self.opened.get(site) is None:
+                print(f"⚡ {site} failed {self.failures[site]} times in a row, skipping its remaining URLs")
+            self.opened[site] = time.monotonic()
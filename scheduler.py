@@ -0,0 +1,132 @@
+import argparse
+import glob
+import heapq
+import json
+import os
+import statistics
+from collections import defaultdict
+from results_store import RESULTS_DIR
+from timeline import TIMELINE_DIR, top_level
+
+# Runs per URL the estimate looks back on, older ones no longer say much about the page
+HISTORY = 5
+
+
+def _read_run(kind, path):
+    """
+    {url: seconds} of one results or timeline file, pages that failed are left out: preflight,
+    breaker and structure failures never loaded them and other failures stop at a timeout.
+    """
+    run = defaultdict(float)
+    failed = set()
+    with open(path, 'r', encoding='utf-8') as f:
+        if kind == "results":
+            for line in f:
+                entry = json.loads(line)
+                if entry["status"] != "passed":
+                    failed.add(entry["url"])
+                # A page can record several outcomes (service popup and form), each timed from its start
+                elif entry.get("duration") is not None:
+                    run[entry["url"]] = max(run[entry["url"]], entry["duration"])
+        else:
+            for step in top_level(json.load(f)["steps"]):
+                if step["status"] != "ok":
+                    failed.add(step["url"])
+                run[step["url"]] += step["duration"]
+    return {url: seconds for url, seconds in run.items() if url not in failed}
+
+
+def _observations(results_dir=RESULTS_DIR, timeline_dir=TIMELINE_DIR):
+    """
+    {url: [seconds, ...]} one observation per recorded run, oldest first. Results files time the
+    whole page, timelines only count for URLs no results file has seen.
+    """
+    observations = {"results": defaultdict(list), "timeline": defaultdict(list)}
+    files = [(os.path.getmtime(path), "results", path) for path in glob.glob(os.path.join(results_dir, "*.jsonl"))]
+    files += [(os.path.getmtime(path), "timeline", path) for path in glob.glob(os.path.join(timeline_dir, "*.json"))]
+    for _, kind, path in sorted(files):
+        try:
+            run = _read_run(kind, path)
+        except (OSError, ValueError, KeyError):
+            continue
+        for url, seconds in run.items():
+            observations[kind][url].append(seconds)
+    return {**observations["timeline"], **observations["results"]}
+
+
+def load_durations(results_dir=RESULTS_DIR, timeline_dir=TIMELINE_DIR, history=HISTORY):
+    """{url: expected seconds}, the median of its last `history` recorded runs"""
+    return {
+        url: statistics.median(seconds[-history:])
+        for url, seconds in _observations(results_dir, timeline_dir).items()
+    }
+
+
+def estimator(durations, tasks):
+    """
+    estimate(task) in seconds. URLs without history get the median of their page type, then of
+    everything recorded, so a new page is neither scheduled first nor forgotten at the end.
+    """
+    by_page_type = defaultdict(list)
+    for page_type, _, url in tasks:
+        if url in durations:
+            by_page_type[page_type].append(durations[url])
+    overall = statistics.median(durations.values()) if durations else 60.0
+
+    def estimate(task):
+        page_type, _, url = task
+        if url in durations:
+            return durations[url]
+        return statistics.median(by_page_type[page_type]) if by_page_type[page_type] else overall
+
+    return estimate
+
+
+def longest_first(tasks, workers, estimate):
+    """
+    Longest-processing-time-first sharding: take tasks longest first and give each to the worker
+    with the least predicted work so far. Returns (shards, predicted seconds per shard), each
+    shard itself ordered longest first.
+    """
+    shards = [[] for _ in range(workers)]
+    loads = [(0.0, index) for index in range(workers)]
+    for task in sorted(tasks, key=estimate, reverse=True):
+        load, index = heapq.heappop(loads)
+        shards[index].append(task)
+        heapq.heappush(loads, (load + estimate(task), index))
+    predicted = [0.0] * workers
+    for load, index in loads:
+        predicted[index] = load
+    return shards, predicted
+
+
+def print_plan(shards, predicted, estimate):
+    print(f"Predicted makespan {max(predicted, default=0):.0f}s over {len(shards)} workers")
+    for index, (shard, load) in enumerate(zip(shards, predicted)):
+        print(f"  worker {index}: {len(shard)} pages, {load:.0f}s")
+        for task in shard:
+            print(f"    {estimate(task):>6.0f}s  {task[0]} - {task[1]} - {task[2]}")
+
+
+def print_makespan(predicted, actual):
+    """Predicted vs actual seconds per worker and for the whole run"""
+    print(f"\n⏱️ Makespan: predicted {max(predicted, default=0):.0f}s, actual {max(actual, default=0):.0f}s")
+    for index, (guess, seconds) in enumerate(zip(predicted, actual)):
+        print(f"  worker {index}: predicted {guess:.0f}s, actual {seconds:.0f}s")
+
+
+if __name__ == "__main__":
+    import misfinal
+
+    parser = argparse.ArgumentParser(description="Show how misfinal's URLs would be sharded from recorded durations")
+    parser.add_argument("--workers", type=int, default=4, help="workers, or nodes when splitting across machines")
+    parser.add_argument("--json", action="store_true", help="print the shards as JSON, one list of URLs per worker")
+    args = parser.parse_args()
+
+    tasks = misfinal.all_tasks()
+    estimate = estimator(load_durations(), tasks)
+    shards, predicted = longest_first(tasks, args.workers, estimate)
+    if args.json:
+        print(json.dumps([[task[2] for task in shard] for shard in shards], indent=2))
+    else:
+        print_plan(shards, predicted, estimate)
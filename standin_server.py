@@ -0,0 +1,378 @@
+import argparse
+import json
+import threading
+import time
+from email import message_from_bytes
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from socketserver import StreamRequestHandler, ThreadingTCPServer
+from urllib.parse import urlparse
+
+# Real site host -> path prefix on the stand-in server
+SITE_PREFIXES = {
+    "magnetoitsolutions.com": "/magneto",
+    "bytestechnolab.com": "/bytes",
+    "nexstaralliance.com": "/nexstar",
+}
+
+PAGE_STYLE = """
+<style>
+  body { font-family: sans-serif; margin: 0; }
+  .hero { height: 900px; background: #eee; }
+  form { padding: 20px; display: grid; gap: 8px; max-width: 480px; }
+  .popup_wpr { display: none; position: fixed; inset: 10%; background: #fff; border: 1px solid #333; z-index: 10; }
+  .popup_wpr.popup_show { display: block; }
+  .thank_you { color: green; }
+</style>
+"""
+
+# Mirrors the sites' loader: lazyJs scripts only run after the first user interaction
+LAZY_LOADER = """
+<script>
+(function () {
+  var done = false;
+  function activate() {
+    if (done) return;
+    done = true;
+    document.querySelectorAll('script[type="lazyJs"]').forEach(function (old) {
+      var script = document.createElement('script');
+      script.text = old.text;
+      old.replaceWith(script);
+    });
+  }
+  ['mousemove', 'scroll', 'touchstart', 'keydown'].forEach(function (name) {
+    window.addEventListener(name, activate, {passive: true});
+    document.addEventListener(name, activate, {passive: true});
+  });
+})();
+</script>
+"""
+
+# Magneto forms post over fetch and show an inline message, like the live site
+AJAX_SUBMIT = """
+<script>
+document.querySelectorAll('form[data-ajax]').forEach(function (form) {
+  form.addEventListener('submit', function (event) {
+    event.preventDefault();
+    fetch('/__submit', {method: 'POST', body: new FormData(form)}).then(function (response) {
+      var message = document.createElement('p');
+      message.className = response.ok ? 'thank_you' : 'form_error';
+      message.textContent = response.ok ? 'Thank you' : 'Submission failed';
+      form.appendChild(message);
+      var popup = form.closest('.popup_wpr');
+      if (popup && response.ok) popup.classList.remove('popup_show');
+    });
+  });
+});
+</script>
+"""
+
+
+def _input(id=None, name=None, type="text"):
+    attrs = "".join(f' {key}="{value}"' for key, value in (("id", id), ("name", name), ("type", type)) if value)
+    return f"<input{attrs}>"
+
+
+def _textarea(id=None, name=None):
+    attrs = "".join(f' {key}="{value}"' for key, value in (("id", id), ("name", name)) if value)
+    return f"<textarea{attrs}></textarea>"
+
+
+def _select(id=None, name=None, options=("Select", "Option 1", "Option 2", "Option 3")):
+    attrs = "".join(f' {key}="{value}"' for key, value in (("id", id), ("name", name)) if value)
+    return f"<select{attrs}>" + "".join(f'<option value="{o}">{o}</option>' for o in options) + "</select>"
+
+
+def _page(title, body, lazy_scripts=""):
+    return (
+        f"<!DOCTYPE html><html><head><title>{title}</title>{PAGE_STYLE}</head><body>"
+        f'<div class="hero">{title}</div>{body}{AJAX_SUBMIT}{lazy_scripts}{LAZY_LOADER}</body></html>'
+    )
+
+
+def _popup_script(delay):
+    return f"""
+<script type="lazyJs">
+setTimeout(function () {{ document.querySelector('.popup_wpr').classList.add('popup_show'); }}, {int(delay * 1000)});
+</script>
+<script>
+document.querySelector('button.close_img_btn').addEventListener('click', function () {{
+  document.querySelector('.popup_wpr').classList.remove('popup_show');
+}});
+</script>
+"""
+
+
+def magneto_form(kind):
+    """ElementLocators forms of misfinal/misnew/mis/mispopup"""
+    fields = [_input("SingleLine1", "SingleLine1"), _input("Email", "Email", "email"), _input("mobile_label", "mobile", "tel")]
+    if kind == "full":
+        fields += [
+            _input(name="SingleLine"),
+            _select("service_label", "Dropdown"),
+            _select("budget_label", "Dropdown1"),
+            _select("start_label", "Dropdown2"),
+            _select("requirement_label", "Dropdown3"),
+        ]
+    elif kind == "ppc":
+        fields.append(_select("service_label", "Dropdown"))
+    fields.append(_textarea(name="MultiLine"))
+    fields.append('<button type="submit" id="btn-validate">Submit</button>')
+    return f'<form id="magneto_form" data-ajax>{"".join(fields)}</form>'
+
+
+def magneto_popup():
+    return (
+        '<div class="popup_wpr"><button class="close_img_btn">x</button><form data-ajax>'
+        + _input("popup_name") + _input("popup_business_email", type="email") + _input("popup_phone", type="tel")
+        + _textarea("popup_business_details")
+        + '<button type="submit" id="btn-validates">Submit</button></form></div>'
+    )
+
+
+def magneto_career_form():
+    fields = [
+        _input("name", "name"), _input("email", "email", "email"), _input(name="phone_number", type="tel"),
+        _select("gender", "gender", ("Select", "Male", "Female")),
+        _input("notice_period"), _input("preferred_job_city"), _input("enter_your_current_job_title"),
+        _input("total_year_experience"), _input("enter_your_relevant_experience_year"),
+        _input("enter_your_current_employer"), _input("enter_your_current_salary_in_lacs"),
+        _input("enter_your_expected_salary_in_lacs"), _textarea("additional_info"),
+        _input("resume_upload", "resume", "file"),
+        '<button type="submit" id="carrer_form_submit">Apply</button>',
+    ]
+    return f'<form id="career_form" data-ajax>{"".join(fields)}</form>'
+
+
+def bytes_form(kind):
+    """Locator Enums of bytes.py, native POST like the live site"""
+    if kind == "contact":
+        fields = [
+            _input("full_name"), _input("email_id", type="email"), _input("contact_number", type="tel"), _input("company_url"),
+            _select("service_label"), _select("budget_label"), _select("requirement_label"), _select("start_label"),
+            _textarea("project_description"), '<button type="submit" id="v3_insert">Submit</button>',
+        ]
+    elif kind == "lets_talk":
+        fields = [
+            _input("fullName_lets_talk_home"), _input("email_lets_talk_home", type="email"),
+            _input("contact_number", type="tel"), _input("company_url_2"), _select("single_service_home"),
+            _textarea("project_description_2"), '<button type="submit" class="primary_btn">Submit</button>',
+        ]
+    elif kind == "service":
+        fields = [
+            _input("full_name"), _input("email_id", type="email"), _input("contact_number", type="tel"), _input("company_url"),
+            _select("single_service"), _textarea("project_description"),
+            '<button type="submit" class="primary_btn">Submit</button>',
+        ]
+    elif kind == "hire":
+        fields = [
+            _input("full_name"), _input("email_id", type="email"), _input("contact_number", type="tel"), _input("company_url"),
+            _select("service_label"), _select("budget_label"), _select("requirement_label"), _select("start_label"),
+            _textarea("project_description"), '<button type="submit" class="primary_btn">Submit</button>',
+        ]
+    else:
+        fields = [
+            _input(name="fname"), _input("email_id", type="email"), _input(name="contact_number", type="tel"),
+            _input(name="total-experience"), _input(name="relevant-experience"), _input(name="Current-CTC"),
+            _input(name="Expected-CTC"), _input(name="Current-Location"), _input(name="notice-period"),
+            _input("resume", "resume", "file"), '<button type="submit" id="applynow">Apply Now</button>',
+        ]
+    return f'<form action="/__submit" method="post" enctype="multipart/form-data">{"".join(fields)}</form>'
+
+
+def nexstar_form():
+    return (
+        '<form id="nexstar_contact" action="/__submit" method="post">'
+        + "".join(f"<div>{field}</div>" for field in (
+            _input("name"), _input("email", type="email"), _input("tel", type="tel"),
+            _select("select", options=("Choose", "Test", "Other")), _textarea("message"),
+        ))
+        + '<input type="submit" value="Send"></form>'
+    )
+
+
+def render(path, popup_delay=20, hire_popup_delay=2):
+    """HTML for a stand-in path, or None when no page matches"""
+    if path.startswith("/magneto/"):
+        if "book-a-free-consultation" in path or path.endswith("/contact/"):
+            return _page("Magneto Contact", magneto_form("full"))
+        if "/ppc/" in path:
+            return _page("Magneto PPC", magneto_form("ppc"))
+        if "/services/" in path:
+            return _page("Magneto Service", magneto_form("short") + magneto_popup(), _popup_script(popup_delay))
+        if "current-opening" in path:
+            return _page("Magneto Career", magneto_career_form())
+        if "develop" in path:
+            return _page("Magneto Hire", magneto_form("short") + magneto_popup(), _popup_script(hire_popup_delay))
+    elif path.startswith("/bytes/"):
+        if "contact-us" in path:
+            return _page("Bytes Contact", bytes_form("contact"))
+        if "our-services" in path:
+            return _page("Bytes Services", bytes_form("service"))
+        if "hire-developers" in path:
+            return _page("Bytes Hire", bytes_form("hire"))
+        if "opportunities" in path:
+            return _page("Bytes Career", bytes_form("career"))
+        return _page("Bytes Home", bytes_form("lets_talk"))
+    elif path.startswith("/nexstar/"):
+        return _page("Nexstar", '<div class="hero"></div>' * 4 + nexstar_form())
+    return None
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    latency = 0.0
+    popup_delay = 20
+    hire_popup_delay = 2
+    submit_status = 200
+    stats = {"pages": 0, "submissions": 0}
+    lock = threading.Lock()
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, status, body, content_type="text/html; charset=utf-8"):
+        data = body.encode()
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        path = urlparse(self.path).path
+        if path == "/__stats":
+            with self.lock:
+                return self._send(200, json.dumps(self.stats), "application/json")
+        time.sleep(self.latency)
+        html = render(path, self.popup_delay, self.hire_popup_delay)
+        if html is None:
+            return self._send(404, "<h1>Not found</h1>")
+        with self.lock:
+            self.stats["pages"] += 1
+        self._send(200, html)
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        self.rfile.read(length)
+        time.sleep(self.latency)
+        if urlparse(self.path).path != "/__submit":
+            return self._send(404, "<h1>Not found</h1>")
+        with self.lock:
+            self.stats["submissions"] += 1
+        body = "<h1>Thank you</h1>" if self.submit_status < 400 else "<h1>Submission failed</h1>"
+        self._send(self.submit_status, body)
+
+
+def standin_url(url, base_url):
+    """Map a live site URL onto the stand-in server, keeping path and query"""
+    parsed = urlparse(url)
+    host = (parsed.hostname or "").removeprefix("www.")
+    prefix = SITE_PREFIXES[host]
+    path = parsed.path or "/"
+    return f"{base_url}{prefix}{path}" + (f"?{parsed.query}" if parsed.query else "")
+
+
+def start_server(port=0, latency=0.0, popup_delay=20, hire_popup_delay=2, submit_status=200):
+    """Serve the stand-in site from a daemon thread, returns (server, base_url)"""
+    handler = type("ConfiguredStandInHandler", (StandInHandler,), {
+        "latency": latency,
+        "popup_delay": popup_delay,
+        "hire_popup_delay": hire_popup_delay,
+        "submit_status": submit_status,
+        "stats": {"pages": 0, "submissions": 0},
+    })
+    server = ThreadingHTTPServer(("127.0.0.1", port), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+class SMTPStandInHandler(StreamRequestHandler):
+    """Just enough SMTP for smtplib.sendmail, every accepted message is kept in `messages`"""
+    latency = 0.0
+    fail_first = 0
+    messages = []
+    attempts = {"count": 0}
+    lock = threading.Lock()
+
+    def _reply(self, line):
+        self.wfile.write(f"{line}\r\n".encode())
+
+    def handle(self):
+        self._reply("220 stand-in SMTP ready")
+        sender, recipients = None, []
+        while True:
+            line = self.rfile.readline().decode(errors="replace").rstrip("\r\n")
+            if not line:
+                return
+            command = line.split(" ", 1)[0].upper()
+            if command in ("HELO", "EHLO"):
+                self._reply("250 stand-in")
+            elif command == "MAIL":
+                sender, recipients = line.split(":", 1)[1].strip(), []
+                self._reply("250 OK")
+            elif command == "RCPT":
+                recipients.append(line.split(":", 1)[1].strip())
+                self._reply("250 OK")
+            elif command == "DATA":
+                self._reply("354 End data with <CR><LF>.<CR><LF>")
+                data = b""
+                while True:
+                    chunk = self.rfile.readline()
+                    if not chunk or chunk in (b".\r\n", b".\n"):
+                        break
+                    data += chunk[1:] if chunk.startswith(b"..") else chunk
+                time.sleep(self.latency)
+                with self.lock:
+                    self.attempts["count"] += 1
+                    rejected = self.attempts["count"] <= self.fail_first
+                    if not rejected:
+                        message = message_from_bytes(data)
+                        self.messages.append({"from": sender, "to": recipients, "message": message})
+                        print(f"Stand-in SMTP accepted: {message['Subject']}")
+                self._reply("451 Try again later" if rejected else "250 Queued")
+            elif command == "RSET":
+                sender, recipients = None, []
+                self._reply("250 OK")
+            elif command == "QUIT":
+                self._reply("221 Bye")
+                return
+            else:
+                self._reply("250 OK")
+
+
+def start_smtp_server(port=0, latency=0.0, fail_first=0):
+    """
+    Serve the SMTP stand-in from a daemon thread, returns (server, "host:port") for SMTP_HOST.
+    The first `fail_first` messages are refused with a 451 to exercise retries.
+    """
+    handler = type("ConfiguredSMTPStandInHandler", (SMTPStandInHandler,), {
+        "latency": latency,
+        "fail_first": fail_first,
+        "messages": [],
+        "attempts": {"count": 0},
+    })
+    server = ThreadingTCPServer(("127.0.0.1", port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"127.0.0.1:{server.server_address[1]}"
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Local stand-in for every form the suites target")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds added to every response")
+    parser.add_argument("--popup-delay", type=float, default=20, help="seconds before the service page popup")
+    parser.add_argument("--hire-popup-delay", type=float, default=2, help="seconds before the hire page popup")
+    parser.add_argument("--submit-status", type=int, default=200, help="HTTP status returned for submissions")
+    parser.add_argument("--smtp-port", type=int, default=0, help="also accept report mail on this port (SMTP_HOST)")
+    parser.add_argument("--smtp-fail-first", type=int, default=0, help="refuse this many messages before accepting")
+    args = parser.parse_args()
+
+    server, base_url = start_server(args.port, args.latency, args.popup_delay, args.hire_popup_delay, args.submit_status)
+    print(f"Stand-in site running at {base_url} (e.g. {standin_url('https://magnetoitsolutions.com/contact/?qa=test', base_url)})")
+    if args.smtp_port:
+        smtp_server, smtp_host = start_smtp_server(args.smtp_port, fail_first=args.smtp_fail_first)
+        print(f"Stand-in SMTP running at {smtp_host}, run the suites with SMTP_HOST={smtp_host}")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
@@ -0,0 +1,227 @@
+import time
+from selenium.common.exceptions import StaleElementReferenceException, WebDriverException
+from selenium.webdriver.remote.webelement import WebElement
+from selenium.webdriver.support.ui import Select, WebDriverWait
+from timeline import timed
+import network_capture
+
+# Upper bound for any single step, the step returns as soon as its condition holds
+DEFAULT_CEILING = 15
+POLL_INTERVAL = 0.1
+
+# Counts in-flight fetch/XHR requests so "network idle" and "form response seen" can be observed
+REQUEST_TRACKER_JS = """
+if (!window.__stepTracker) {
+    const tracker = window.__stepTracker = {id: Math.random(), pending: 0, started: 0, finished: 0, last: Date.now()};
+    const begin = () => { tracker.pending++; tracker.started++; tracker.last = Date.now(); };
+    const end = () => { tracker.pending = Math.max(0, tracker.pending - 1); tracker.finished++; tracker.last = Date.now(); };
+    const originalFetch = window.fetch;
+    if (originalFetch) {
+        window.fetch = function () {
+            begin();
+            return originalFetch.apply(this, arguments).finally(end);
+        };
+    }
+    const originalSend = XMLHttpRequest.prototype.send;
+    XMLHttpRequest.prototype.send = function () {
+        begin();
+        this.addEventListener('loadend', end, {once: true});
+        return originalSend.apply(this, arguments);
+    };
+}
+const tracker = window.__stepTracker;
+return {id: tracker.id, pending: tracker.pending, started: tracker.started, finished: tracker.finished,
+        idle_ms: Date.now() - tracker.last, ready: document.readyState, url: location.href};
+"""
+
+
+def _resolve(driver, target):
+    if isinstance(target, WebElement):
+        return target
+    return driver.find_element(*target)
+
+
+def _label(target):
+    return "element" if isinstance(target, WebElement) else target[1]
+
+
+def _normalize(value):
+    return "".join(ch for ch in (value or "") if ch.isalnum()).lower()
+
+
+def request_state(driver):
+    """Install the request tracker if needed and return its counters"""
+    return driver.execute_script(REQUEST_TRACKER_JS)
+
+
+def element_interactable(target):
+    """Element is attached, displayed and enabled"""
+    def condition(driver):
+        try:
+            element = _resolve(driver, target)
+            if element.is_displayed() and element.is_enabled():
+                return element
+        except (StaleElementReferenceException, WebDriverException):
+            pass
+        return False
+    return condition
+
+
+def options_loaded(target, index):
+    """Select element has at least index + 1 options"""
+    def condition(driver):
+        try:
+            element = _resolve(driver, target)
+            if element.is_enabled() and len(Select(element).options) > index:
+                return element
+        except (StaleElementReferenceException, WebDriverException):
+            pass
+        return False
+    return condition
+
+
+def value_committed(target, value):
+    """Element value reflects the typed value (input masks may add formatting)"""
+    expected = _normalize(value)
+
+    def condition(driver):
+        try:
+            element = _resolve(driver, target)
+            return expected in _normalize(element.get_attribute("value"))
+        except (StaleElementReferenceException, WebDriverException):
+            return False
+    return condition
+
+
+def selection_committed(target, index):
+    """Select element has the requested option selected"""
+    def condition(driver):
+        try:
+            element = _resolve(driver, target)
+            return driver.execute_script("return arguments[0].selectedIndex;", element) == index
+        except (StaleElementReferenceException, WebDriverException):
+            return False
+    return condition
+
+
+def network_idle(quiet_ms=500):
+    """Document loaded and no fetch/XHR in flight for quiet_ms"""
+    def condition(driver):
+        try:
+            state = request_state(driver)
+        except WebDriverException:
+            return False
+        return state["ready"] == "complete" and state["pending"] == 0 and state["idle_ms"] >= quiet_ms
+    return condition
+
+
+def form_response_seen(before):
+    """A request started after `before` has completed, or the page navigated away"""
+    def condition(driver):
+        try:
+            state = request_state(driver)
+        except WebDriverException:
+            return False
+        if state["id"] != before["id"] or state["url"] != before["url"]:
+            return state["ready"] != "loading"
+        return state["started"] > before["started"] and state["pending"] == 0
+    return condition
+
+
+def submission_confirmed(since, site, methods=("POST",), webview=None, action=None):
+    """The form's own request got a successful response, raises SubmissionRejected otherwise"""
+    def condition(driver):
+        return network_capture.form_response(driver, since, site, methods, webview, action)
+    return condition
+
+
+class Steps:
+    """Form actions that each wait for their own readiness condition instead of sleeping"""
+
+    def __init__(self, driver, ceiling=DEFAULT_CEILING, timeline=None, url=""):
+        self.driver = driver
+        self.ceiling = ceiling
+        # Optional timeline.Timeline, every step is recorded against url
+        self.timeline = timeline
+        self.url = url
+
+    def timed(self, kind, name=""):
+        return timed(self.timeline, kind, self.url, name)
+
+    def wait(self, condition, ceiling=None, message=""):
+        return WebDriverWait(self.driver, ceiling or self.ceiling, poll_frequency=POLL_INTERVAL).until(
+            condition, message
+        )
+
+    def ready(self, target, ceiling=None):
+        """Wait until the element can be interacted with and return it"""
+        with self.timed("locate", _label(target)):
+            return self.wait(element_interactable(target), ceiling, f"{target} not interactable")
+
+    def type(self, target, value, clear=False, commit=True):
+        with self.timed("fill", _label(target)):
+            element = self.ready(target)
+            if clear:
+                element.clear()
+            element.send_keys(value)
+            if commit:
+                self.wait(value_committed(element, value), message=f"{target} did not accept value")
+            return element
+
+    def select(self, target, index):
+        with self.timed("select", _label(target)):
+            element = self.wait(options_loaded(target, index), message=f"{target} has no option {index}")
+            Select(element).select_by_index(index)
+            self.wait(selection_committed(element, index), message=f"{target} did not select option {index}")
+            return element
+
+    def click(self, target, scroll=True, js=False):
+        with self.timed("click", _label(target)):
+            element = self.ready(target)
+            if scroll:
+                self.driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", element)
+            if js:
+                self.driver.execute_script("arguments[0].click();", element)
+            else:
+                element.click()
+            return element
+
+    def submit(self, target, ceiling=None, js=False):
+        """Click the submit button and wait until the form's response has been seen"""
+        with self.timed("submit", _label(target)):
+            before = request_state(self.driver)
+            started = time.monotonic()
+            self.click(target, js=js)
+            self.wait(form_response_seen(before), ceiling, "no form response seen")
+            return time.monotonic() - started
+
+    def submit_confirmed(self, target, ceiling=None, js=False, methods=("POST",)):
+        """
+        Click the submit button and return {"url", "method", "status", "latency"} as soon as the
+        form's POST/XHR is answered. Needs network_capture.enable() on the driver options.
+        """
+        with self.timed("submit", _label(target)) as record:
+            pending = self.start_submission(target, js=js, methods=methods)
+            response = self.confirm_submission(pending, ceiling)
+            if record is not None:
+                record["response"] = response
+            return response
+
+    def start_submission(self, target, js=False, methods=("POST",)):
+        """Click submit without waiting, pass the result to confirm_submission() later"""
+        element = self.ready(target)
+        action = self.driver.execute_script("const element = arguments[0];" + network_capture.FORM_ACTION_JS, element)
+        since = network_capture.mark(self.driver)
+        site = network_capture.site_of(self.driver.current_url)
+        webview = self.driver.current_window_handle
+        self.click(element, js=js)
+        return submission_confirmed(since, site, methods, webview, action)
+
+    def confirm_submission(self, pending, ceiling=None):
+        """Wait for the response to a start_submission(), works from any tab"""
+        return self.wait(pending, ceiling, "no form submission response seen")
+
+    def settle(self, ceiling=None, quiet_ms=500):
+        """Wait for the page to go network idle"""
+        with self.timed("wait", "network idle"):
+            self.wait(network_idle(quiet_ms), ceiling, "network did not go idle")
@@ -0,0 +1,163 @@
+import unittest
+from unittest import mock
+from selenium.common.exceptions import TimeoutException, WebDriverException
+from network_capture import SubmissionRejected
+from retry_policy import CircuitBreaker, CircuitOpen, RetryPolicy, is_outage
+
+
+class FakeClock:
+    """Stands in for retry_policy's time module, sleep() moves monotonic() forward"""
+
+    def __init__(self):
+        self.now = 1000.0
+        self.slept = []
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.slept.append(seconds)
+        self.now += seconds
+
+
+class RetryPolicyTests(unittest.TestCase):
+
+    def setUp(self):
+        self.clock = FakeClock()
+        patcher = mock.patch("retry_policy.time", self.clock)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_yields_every_attempt_within_budget(self):
+        self.assertEqual(list(RetryPolicy(attempts=4, budget=120)), [1, 2, 3, 4])
+
+    def test_stops_when_budget_runs_out(self):
+        policy = RetryPolicy(attempts=4, budget=100)
+        attempts = []
+        for attempt in policy:
+            attempts.append(attempt)
+            self.clock.now += 60
+        self.assertEqual(attempts, [1, 2])
+
+    def test_timeout_is_clamped_to_remaining_budget(self):
+        policy = RetryPolicy(attempts=4, budget=100)
+        iter(policy).__next__()
+        self.clock.now += 80
+        self.assertEqual(policy.timeout(30), 20)
+        self.assertEqual(policy.timeout(10), 10)
+
+    def test_backoff_never_passes_the_deadline(self):
+        policy = RetryPolicy(attempts=4, budget=10, base=2, cap=15)
+        iter(policy).__next__()
+        self.clock.now += 9
+        with mock.patch("retry_policy.random.uniform", return_value=8):
+            policy.backoff(3)
+        self.assertEqual(self.clock.slept, [1])
+
+    def test_backoff_grows_up_to_cap(self):
+        policy = RetryPolicy(attempts=10, budget=1000, base=2, cap=15)
+        iter(policy).__next__()
+        with mock.patch("retry_policy.random.uniform", side_effect=lambda low, high: high):
+            for attempt in (1, 2, 3, 4, 5):
+                policy.backoff(attempt)
+        self.assertEqual(self.clock.slept, [2, 4, 8, 15, 15])
+
+
+class IsOutageTests(unittest.TestCase):
+
+    def test_network_failures_count(self):
+        self.assertTrue(is_outage(WebDriverException("unknown error: net::ERR_CONNECTION_REFUSED")))
+        self.assertTrue(is_outage(TimeoutException("timeout: Timed out receiving message from renderer: 30.000")))
+        self.assertTrue(is_outage(SubmissionRejected("POST /contact returned 503", 503)))
+        self.assertTrue(is_outage(SubmissionRejected("POST /contact failed: net::ERR_FAILED")))
+
+    def test_form_failures_do_not_count(self):
+        self.assertFalse(is_outage(TimeoutException("form not ready on https://example.com/contact")))
+        self.assertFalse(is_outage(TimeoutException("no form submission response seen")))
+        self.assertFalse(is_outage(SubmissionRejected("POST /contact returned 422", 422)))
+        self.assertFalse(is_outage(ValueError("popup did not appear")))
+
+
+class CircuitBreakerTests(unittest.TestCase):
+    URL = "https://www.example.com/contact"
+    OUTAGE = WebDriverException("unknown error: net::ERR_CONNECTION_TIMED_OUT")
+
+    def setUp(self):
+        self.clock = FakeClock()
+        patcher = mock.patch("retry_policy.time", self.clock)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.breaker = CircuitBreaker(threshold=3, cooldown=300)
+
+    def fail(self, times, url=URL, error=OUTAGE):
+        for _ in range(times):
+            self.breaker.record(url, error)
+
+    def test_opens_after_threshold_outages_in_a_row(self):
+        self.fail(2)
+        self.breaker.check(self.URL)
+        self.fail(1)
+        with self.assertRaises(CircuitOpen):
+            self.breaker.check(self.URL)
+
+    def test_whole_site_is_skipped(self):
+        self.fail(3)
+        with self.assertRaises(CircuitOpen):
+            self.breaker.check("https://example.com/services/")
+        self.breaker.check("https://other.com/contact")
+
+    def test_success_resets_the_count(self):
+        self.fail(2)
+        self.breaker.record(self.URL)
+        self.fail(2)
+        self.breaker.check(self.URL)
+
+    def test_broken_forms_do_not_open_it(self):
+        self.fail(5, error=TimeoutException("form not ready"))
+        self.breaker.check(self.URL)
+
+    def test_broken_form_shows_the_site_is_up(self):
+        self.fail(2)
+        self.breaker.record(self.URL, TimeoutException("form not ready"))
+        self.fail(2)
+        self.breaker.check(self.URL)
+
+    def test_half_open_probe_after_cooldown(self):
+        self.fail(3)
+        self.clock.now += 301
+        self.breaker.check(self.URL)
+        self.fail(1)
+        with self.assertRaises(CircuitOpen):
+            self.breaker.check(self.URL)
+
+    def test_only_one_probe_at_a_time(self):
+        self.fail(3)
+        self.clock.now += 301
+        self.breaker.check(self.URL)
+        with self.assertRaises(CircuitOpen):
+            self.breaker.check("https://example.com/services/")
+        self.breaker.record(self.URL)
+        self.breaker.check("https://example.com/services/")
+
+    def test_failed_probe_restarts_cooldown(self):
+        self.fail(3)
+        self.clock.now += 301
+        self.breaker.check(self.URL)
+        self.fail(1)
+        self.clock.now += 299
+        with self.assertRaises(CircuitOpen):
+            self.breaker.check(self.URL)
+        self.clock.now += 2
+        self.breaker.check(self.URL)
+
+    def test_successful_probe_closes_it(self):
+        self.fail(3)
+        self.clock.now += 301
+        self.breaker.check(self.URL)
+        self.breaker.record(self.URL)
+        self.fail(2)
+        self.breaker.check(self.URL)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,97 @@
+import json
+import math
+import os
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+
+TIMELINE_DIR = os.getenv("TIMELINE_DIR", "timelines")
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile"""
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def top_level(steps):
+    """Steps not running inside another step, their durations never overlap"""
+    return [record for record in steps if not record.get("depth")]
+
+
+class Timeline:
+    """
+    Start/end timestamps of every navigation, locate, fill, select, submit and wait in a run.
+    Steps can nest (a fill locates its element first), each record keeps its depth so per-URL
+    totals only add up the outermost ones.
+    """
+
+    def __init__(self, suite, steps=None):
+        self.suite = suite
+        self.run_id = f"{suite}-{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}"
+        self.steps = steps if steps is not None else []
+        self.depth = 0
+
+    @contextmanager
+    def step(self, kind, url, name=""):
+        record = {"kind": kind, "url": url, "name": name, "start": time.time(), "status": "ok", "depth": self.depth}
+        started = time.perf_counter()
+        self.depth += 1
+        try:
+            yield record
+        except BaseException as e:
+            record["status"] = "error"
+            record["error"] = f"{type(e).__name__}: {e}".splitlines()[0]
+            raise
+        finally:
+            self.depth -= 1
+            record["duration"] = time.perf_counter() - started
+            record["end"] = record["start"] + record["duration"]
+            self.steps.append(record)
+
+    def save(self, directory=TIMELINE_DIR):
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, f"{self.run_id}.json")
+        with open(path, 'w') as f:
+            json.dump({"suite": self.suite, "run_id": self.run_id, "steps": self.steps}, f, indent=2)
+        return path
+
+    def summary(self):
+        """
+        {"kind": {...}, "url": {...}} of count, p50, p95 and total seconds. Kinds cover every step
+        at any depth, URLs only the top-level ones so their totals are wall time.
+        """
+        groups = {"kind": defaultdict(list), "url": defaultdict(list)}
+        for record in self.steps:
+            groups["kind"][record["kind"]].append(record["duration"])
+        for record in top_level(self.steps):
+            groups["url"][record["url"]].append(record["duration"])
+        return {
+            group: {
+                key: {
+                    "count": len(durations),
+                    "p50": percentile(durations, 50),
+                    "p95": percentile(durations, 95),
+                    "total": sum(durations),
+                }
+                for key, durations in by_key.items()
+            }
+            for group, by_key in groups.items()
+        }
+
+    def print_summary(self):
+        for group, stats in self.summary().items():
+            print(f"\n⏱️ Step timings per {group} ({self.run_id})")
+            for key, row in sorted(stats.items(), key=lambda item: -item[1]["total"]):
+                print(f"  {key:<70} n={row['count']:<4} p50={row['p50']:.2f}s p95={row['p95']:.2f}s total={row['total']:.1f}s")
+
+
+@contextmanager
+def timed(timeline, kind, url, name=""):
+    """Timeline.step() that is a no-op when no timeline is attached"""
+    if timeline is None:
+        yield None
+    else:
+        with timeline.step(kind, url, name) as record:
+            yield record
@@ -0,0 +1,57 @@
+import os
+
+# Opt in with MIS_VIRTUAL_TIME=1, real visitors never see a page fast-forwarded
+ENABLED = os.getenv("MIS_VIRTUAL_TIME") == "1"
+
+# Longest real delay a fast-forwarded timer keeps, in ms
+DEFAULT_MAX_DELAY = 50
+
+# Runs before any page script. Timeouts are clamped to max_delay and, as each one fires, the clock
+# (Date.now(), new Date() and performance.now()) moves forward to the time it was due, never back,
+# so code that compares timestamps sees the time as passed too. Intervals keep their real period.
+FAST_TIMERS_JS = """
+(function () {
+  if (window.__virtualTime) return;
+  var MAX_DELAY = %(max_delay)d;
+  var clock = window.__virtualTime = {skew: 0};
+  var originalSetTimeout = window.setTimeout;
+  var OriginalDate = Date;
+  var originalDateNow = Date.now;
+  var originalPerformanceNow = performance.now.bind(performance);
+  function now() { return originalDateNow() + clock.skew; }
+  window.setTimeout = function (callback, delay) {
+    var args = Array.prototype.slice.call(arguments, 2);
+    delay = Number(delay) || 0;
+    if (typeof callback !== 'function' || delay <= MAX_DELAY) {
+      return originalSetTimeout.apply(window, arguments);
+    }
+    var due = now() + delay;
+    return originalSetTimeout.call(window, function () {
+      clock.skew = Math.max(clock.skew, due - originalDateNow());
+      return callback.apply(window, args);
+    }, MAX_DELAY);
+  };
+  var VirtualDate = function Date() {
+    if (!new.target) return new OriginalDate(now()).toString();
+    return Reflect.construct(OriginalDate, arguments.length ? arguments : [now()], new.target);
+  };
+  VirtualDate.prototype = OriginalDate.prototype;
+  VirtualDate.parse = OriginalDate.parse;
+  VirtualDate.UTC = OriginalDate.UTC;
+  VirtualDate.now = now;
+  window.Date = VirtualDate;
+  performance.now = function () { return originalPerformanceNow() + clock.skew; };
+})();
+"""
+
+
+def fast_forward_timers(driver, max_delay=DEFAULT_MAX_DELAY):
+    """
+    Clamp every page timeout of the current tab to max_delay ms from the next navigation on, so
+    delayed popups, lazy loaders and debounced validators fire at once. Install before
+    popup_watch.watch_popups() so the watcher still sees the page's original delays.
+    """
+    driver.execute_cdp_cmd(
+        "Page.addScriptToEvaluateOnNewDocument", {"source": FAST_TIMERS_JS % {"max_delay": max_delay}}
+    )
+